@@ -0,0 +1,3187 @@
+"""
+PRGR launch monitor application - Qt managers, frame provider and ball capture
+
+Started through main.py. Kept out of the entry script because the preview
+capture process and the replay GIF worker use the "spawn" start method, which
+re-runs the entry script's top level in every child.
+"""
+
+import sys
+import os
+import math
+import bisect
+import signal
+import subprocess
+import threading
+import queue
+import time
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+os.environ["QT_QUICK_CONTROLS_STYLE"] = "Material"
+
+from PySide6.QtGui import QGuiApplication, QImage
+from PySide6.QtQml import QQmlApplicationEngine, qmlRegisterType, QQmlImageProviderBase
+from PySide6.QtQuick import QQuickImageProvider
+from PySide6.QtCore import qInstallMessageHandler, QObject, Signal, Slot, Property, QUrl, QSize, QTimer
+from PySide6.QtMultimedia import QSoundEffect
+from ProfileManager import ProfileManager
+from HistoryManager import HistoryManager
+from SettingsManager import SettingsManager
+from kld2_manager import KLD2Manager
+from replay_worker import encode_replay_gif, GIF_AVAILABLE
+from preview_capture import SharedFrameBuffer, get_context, run_preview, reserve_camera_core, pin_capture_thread, manual_camera_controls, DEBUG
+
+# Try to import Picamera2 and cv2 (only works on Pi)
+try:
+    from picamera2 import Picamera2, MappedArray
+    from picamera2.encoders import H264Encoder
+    from picamera2.outputs import FfmpegOutput
+    import cv2
+    from ball_tracker import BallTracker
+    CAMERA_AVAILABLE = True
+except ImportError:
+    CAMERA_AVAILABLE = False
+    print("Picamera2 or OpenCV not available - capture features disabled")
+
+# OpenCV thread pool: small 640x480 frames don't amortize parallel_for dispatch,
+# and extra workers compete with the capture thread for cores
+OPENCV_THREADS = 2
+if CAMERA_AVAILABLE:
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(OPENCV_THREADS)
+
+# Template-tracked frames between HoughCircles re-validations of the locked ball
+TRACKER_REVALIDATE_FRAMES = 30
+
+# Camera buffers for ball capture - 2 keeps detection at most one frame behind the sensor
+CAPTURE_BUFFER_COUNT = 2
+
+if not GIF_AVAILABLE:
+    print("PIL/Pillow not available - popup replay disabled")
+
+# Try to import fast C++ detection module (3-5x speedup)
+try:
+    import fast_detection
+    FAST_DETECTION_AVAILABLE = True
+    print("Fast C++ detection loaded - using optimized ball detection")
+except ImportError:
+    FAST_DETECTION_AVAILABLE = False
+    print("Fast C++ detection not available - using Python fallback (build with: ./build_fast_detection.sh)")
+
+# Try to import Numba for the fused detection mask kernel
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    print("Numba not available - using OpenCV mask pipeline")
+
+if NUMBA_AVAILABLE:
+    @numba.njit(parallel=True, cache=True)
+    def _morph_ellipse5_numba(src, dst, dilate):
+        """5x5 elliptical erode/dilate of a 0/255 mask
+
+        Same as cv2.erode/cv2.dilate with getStructuringElement(MORPH_ELLIPSE, (5, 5)):
+        pixels outside the image are ignored, like OpenCV's default morphology border.
+        """
+        h, w = src.shape
+        for y in numba.prange(h):
+            for x in range(w):
+                found = False  # dilate: any set pixel under the kernel; erode: any clear pixel
+                for dy in range(-2, 3):
+                    yy = y + dy
+                    if found or yy < 0 or yy >= h:
+                        continue
+                    reach = 0 if dy == -2 or dy == 2 else 2  # Ellipse rows: 1, 5, 5, 5, 1 pixels
+                    for dx in range(-reach, reach + 1):
+                        xx = x + dx
+                        if 0 <= xx < w and (src[yy, xx] != 0) == dilate:
+                            found = True
+                            break
+                if dilate:
+                    dst[y, x] = 255 if found else 0
+                else:
+                    dst[y, x] = 0 if found else 255
+
+    @numba.njit(parallel=True, cache=True)
+    def _canny_numba(gray, edges, low, high):
+        """Canny edges matching cv2.Canny(gray, low, high) (3x3 Sobel, L1 magnitude)
+
+        Follows OpenCV's steps: replicate-border Sobel, non-maximum suppression with
+        its fixed-point 22.5/67.5 degree sectors and tie-breaking, then 8-connected
+        hysteresis from pixels above high through pixels above low.
+        """
+        h, w = gray.shape
+        dxs = np.empty((h, w), dtype=np.int32)
+        dys = np.empty((h, w), dtype=np.int32)
+        mag = np.zeros((h + 2, w + 2), dtype=np.int32)  # Zero border, like OpenCV's padded rows
+
+        for y in numba.prange(h):
+            ym = max(y - 1, 0)
+            yp = min(y + 1, h - 1)
+            for x in range(w):
+                xm = max(x - 1, 0)
+                xp = min(x + 1, w - 1)
+                p00 = np.int32(gray[ym, xm])
+                p01 = np.int32(gray[ym, x])
+                p02 = np.int32(gray[ym, xp])
+                p10 = np.int32(gray[y, xm])
+                p12 = np.int32(gray[y, xp])
+                p20 = np.int32(gray[yp, xm])
+                p21 = np.int32(gray[yp, x])
+                p22 = np.int32(gray[yp, xp])
+                dx = (p02 + 2 * p12 + p22) - (p00 + 2 * p10 + p20)
+                dy = (p20 + 2 * p21 + p22) - (p00 + 2 * p01 + p02)
+                dxs[y, x] = dx
+                dys[y, x] = dy
+                mag[y + 1, x + 1] = abs(dx) + abs(dy)
+
+        # 0 = weak candidate, 1 = not an edge, 2 = edge (padded so hysteresis needs no bounds checks)
+        state = np.ones((h + 2, w + 2), dtype=np.uint8)
+        for y in numba.prange(h):
+            for x in range(w):
+                m = mag[y + 1, x + 1]
+                if m <= low:
+                    continue
+                dx = dxs[y, x]
+                dy = dys[y, x]
+                xs = abs(dx)
+                ys = abs(dy) << 15
+                tg22x = xs * 13573  # tan(22.5 deg) in 1 << 15 fixed point
+                if ys < tg22x:
+                    keep = m > mag[y + 1, x] and m >= mag[y + 1, x + 2]
+                elif ys > tg22x + (xs << 16):
+                    keep = m > mag[y, x + 1] and m >= mag[y + 2, x + 1]
+                else:
+                    s = -1 if (dx ^ dy) < 0 else 1
+                    keep = m > mag[y, x + 1 - s] and m > mag[y + 2, x + 1 + s]
+                if keep:
+                    state[y + 1, x + 1] = 2 if m > high else 0
+
+        # Hysteresis: grow edges into 8-connected weak candidates (each pixel pushed at most once)
+        stride = w + 2
+        stack = np.empty(h * w, dtype=np.int64)
+        top = 0
+        for y in range(1, h + 1):
+            for x in range(1, w + 1):
+                if state[y, x] == 2:
+                    stack[top] = y * stride + x
+                    top += 1
+        while top > 0:
+            top -= 1
+            py = stack[top] // stride
+            px = stack[top] % stride
+            for ny in range(py - 1, py + 2):
+                for nx in range(px - 1, px + 2):
+                    if state[ny, nx] == 0:
+                        state[ny, nx] = 2
+                        stack[top] = ny * stride + nx
+                        top += 1
+
+        for y in numba.prange(h):
+            for x in range(w):
+                edges[y, x] = 255 if state[y + 1, x + 1] == 2 else 0
+
+    @numba.njit(cache=True)
+    def _build_mask_numba(enhanced_gray, out):
+        """Detection mask: (threshold > 50 -> 5x5 open -> 5x5 close) OR Canny(50, 150)
+
+        Produces the same mask as the OpenCV pipeline in _detect_ball, compiled so the
+        steps run without per-call Python/OpenCV dispatch.
+        """
+        h, w = enhanced_gray.shape
+        bright = np.empty((h, w), dtype=np.uint8)
+        for y in range(h):
+            for x in range(w):
+                bright[y, x] = 255 if enhanced_gray[y, x] > 50 else 0
+
+        tmp = np.empty_like(bright)
+        _morph_ellipse5_numba(bright, tmp, False)  # Open: remove small noise
+        _morph_ellipse5_numba(tmp, bright, True)
+        _morph_ellipse5_numba(bright, tmp, True)   # Close: fill small gaps
+        _morph_ellipse5_numba(tmp, bright, False)
+
+        _canny_numba(enhanced_gray, out, 50, 150)
+        for y in range(h):
+            for x in range(w):
+                if bright[y, x]:
+                    out[y, x] = 255
+
+    @numba.njit(cache=True, fastmath=True)
+    def _score_circles_numba(gray, circles):
+        """Compiled version of _detect_ball's circle filtering/scoring loop
+
+        circles is an (N, 3) int array of (x, y, r). Returns (best_idx, best_score),
+        best_idx = -1 if no circle passes the filters.
+        """
+        height, width = gray.shape
+        best_idx = -1
+        best_score = 0.0
+
+        for i in range(circles.shape[0]):
+            x, y, r = circles[i, 0], circles[i, 1], circles[i, 2]
+
+            # Validate bounds
+            if x - r < 0 or x + r >= width or y - r < 0 or y + r >= height:
+                continue
+
+            # Ball size filtering
+            if r < 20 or r > 100:
+                continue
+
+            # Region mean/max in one pass
+            total = 0
+            peak = 0
+            for ry in range(y - r, y + r):
+                for rx in range(x - r, x + r):
+                    v = gray[ry, rx]
+                    total += v
+                    if v > peak:
+                        peak = v
+
+            region_brightness = total / (4 * r * r)
+            if region_brightness < 50:
+                continue
+
+            brightness_contrast = peak - region_brightness
+            if brightness_contrast < 30:
+                continue
+
+            score = peak * 1.5 + brightness_contrast * 2.0 + region_brightness * 1.0
+            score += (y / height) * 30
+            if 30 <= r <= 60:
+                score += 30
+
+            if score > best_score:
+                best_score = score
+                best_idx = i
+
+        return best_idx, best_score
+
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _bayer10_to_gray8_numba(frame, out):
+        """Average 2x2 RGGB blocks of 10-bit Bayer into half-resolution 8-bit gray
+
+        One streaming pass over the uint16 frame - same result as the C++
+        fast_detection.bayer_to_gray before its upscale.
+        """
+        h, w = out.shape
+        for y in numba.prange(h):
+            for x in range(w):
+                total = (np.uint32(frame[2 * y, 2 * x]) + frame[2 * y, 2 * x + 1] +
+                         frame[2 * y + 1, 2 * x] + frame[2 * y + 1, 2 * x + 1])
+                out[y, x] = min(total >> 4, 255)
+
+    # Warm up the kernels at import so JIT compilation (or loading from the
+    # on-disk cache) happens at startup, not on the first detection frame
+    try:
+        _warm_gray = np.zeros((8, 8), dtype=np.uint8)
+        _build_mask_numba(_warm_gray, np.empty_like(_warm_gray))
+        _score_circles_numba(_warm_gray, np.zeros((1, 3), dtype=np.int32))
+        # _detect_ball_roi passes a slice of the frame, which is a separate
+        # (non-contiguous) signature - compile it here too
+        _score_circles_numba(np.zeros((16, 16), dtype=np.uint8)[2:10, 2:10],
+                             np.zeros((1, 3), dtype=np.int32))
+        _bayer10_to_gray8_numba(np.zeros((8, 8), dtype=np.uint16), np.empty((4, 4), dtype=np.uint8))
+        del _warm_gray
+    except Exception as e:
+        NUMBA_AVAILABLE = False
+        print(f"Numba kernel compilation failed - using OpenCV mask pipeline: {e}")
+
+# ============================================
+# Frame Provider Class (for high-FPS Qt preview)
+# ============================================
+class FrameProvider(QQuickImageProvider):
+    """Provides camera frames to QML Image components for smooth high-FPS preview
+
+    Uses a lock-free ring of 3 preallocated buffers: the capture thread copies
+    each frame into a free slot and swaps the "latest" index (atomic under the GIL),
+    while the QML/GUI side converts only the latest frame when it actually requests it.
+    The slot being converted is marked in-flight (and re-checked, as in
+    SharedFrameBuffer.acquire_latest) so the writer never recycles it.
+    """
+
+    def __init__(self):
+        super().__init__(QQmlImageProviderBase.ImageType.Image)
+        # Tiny 4:3 black placeholder - the first real frame sets the actual size
+        self.qimage = QImage(4, 3, QImage.Format.Format_Grayscale8)
+        self.qimage.fill(0)
+        self._lock = threading.Lock()  # Guards only the qimage/_converted_seq swap
+
+        # Buffer ring (written by capture thread, read by GUI thread)
+        self._buffers = [None, None, None]
+        self._latest = 0           # Index of the most recently written buffer
+        self._inflight = -1        # Index of the buffer the GUI thread is converting
+        self.frame_seq = 0         # Incremented every time a new frame is stored
+        self._converted_seq = 0    # frame_seq of the frame currently held in self.qimage
+        self._format_shape = None  # Frame shape self._format was resolved for
+        self._format = None        # QImage format for _format_shape
+
+    def requestImage(self, id, size, requestedSize):
+        """Called by QML Image to get the latest frame
+
+        The conversion runs outside the lock; the lock only covers the
+        pointer swap, so the render thread never waits behind a memcpy.
+        """
+        with self._lock:
+            seq = self.frame_seq
+            if seq == self._converted_seq:
+                return self.qimage
+            # Reserve the latest slot, then re-check it is still the latest. A writer
+            # that picked its slot before seeing the reservation only avoided the
+            # _latest of that moment, so a slot it is filling is never _latest - if
+            # _latest is unchanged after reserving, nobody is writing into it
+            while True:
+                latest = self._latest
+                self._inflight = latest
+                if self._latest == latest:
+                    break
+            frame = self._buffers[latest]
+
+        qimage = self._to_qimage(frame)
+
+        with self._lock:
+            self._inflight = -1
+            # Keep the newest - another request may have converted a later frame meanwhile
+            if qimage is not None and seq > self._converted_seq:
+                self.qimage = qimage
+                self._converted_seq = seq
+            return self.qimage
+
+    def updateFrame(self, frame):
+        """Copy frame into a free ring slot and publish it (called from capture thread)"""
+        # Any slot that is neither the latest nor being converted - always exists with 3
+        latest, inflight = self._latest, self._inflight
+        back = 0 if latest != 0 and inflight != 0 else (1 if latest != 1 and inflight != 1 else 2)
+        buffers = self._buffers
+        buffer = buffers[back]
+        shape = frame.shape
+        if buffer is None or buffer.shape != shape or buffer.dtype != frame.dtype:
+            buffer = np.empty(shape, dtype=frame.dtype)
+            buffers[back] = buffer
+        np.copyto(buffer, frame)
+
+        # Publish - plain int assignments are atomic under the GIL
+        self._latest = back
+        self.frame_seq += 1
+
+    def _to_qimage(self, frame):
+        """Convert numpy array to an owning QImage (called from GUI thread)
+
+        The QImage wraps the numpy buffer directly (no tobytes()); a single
+        QImage.copy() detaches it. No QPixmap conversion - QML uploads the
+        QImage as a texture directly.
+        """
+        if frame is None:
+            return None
+
+        try:
+            # Format depends only on the shape, which is fixed for a camera session
+            if frame.shape != self._format_shape:
+                self._format = self._qimage_format(frame.shape)
+                self._format_shape = frame.shape
+            fmt = self._format
+            if fmt is None:
+                return None
+
+            # Grayscale (H, W, 1) - squeeze to 2D
+            if frame.ndim == 3 and frame.shape[2] == 1:
+                frame = frame[:, :, 0]
+
+            # QImage needs row-contiguous data (no-op for camera frames)
+            if not frame.flags.c_contiguous:
+                frame = np.ascontiguousarray(frame)
+
+            # Wrap numpy array as QImage (frame stays referenced until copy() returns)
+            height, width = frame.shape[:2]
+            return QImage(frame.data, width, height, frame.strides[0], fmt).copy()
+        except Exception as e:
+            print(f"Frame update error: {e}")
+            return None
+
+    @staticmethod
+    def _qimage_format(shape):
+        """QImage format for a frame shape, None if unsupported"""
+        if len(shape) == 2 or (len(shape) == 3 and shape[2] == 1):
+            # Grayscale (H, W) or (H, W, 1)
+            return QImage.Format.Format_Grayscale8
+        if len(shape) == 3:
+            # Byte-ordered QImage formats only - correct on either host endianness
+            if shape[2] == 3:
+                # Picamera2 "RGB888" and OpenCV frames are B,G,R in memory
+                return QImage.Format.Format_BGR888
+            if shape[2] == 4:
+                # XBGR8888 (H, W, 4) - R,G,B,X in memory; X is padding, so the image
+                # is opaque (no alpha blending when QML draws it)
+                return QImage.Format.Format_RGBX8888
+        print(f"Unsupported frame shape: {shape}")
+        return None
+
+# ============================================
+# Camera Manager Class
+# ============================================
+class CameraManager(QObject):
+    """Manages Raspberry Pi camera using rpicam-vid"""
+
+    snapshotSaved = Signal(str)  # Signal emitted when snapshot is saved (with filename)
+    trainingModeProgress = Signal(int, int)  # Signal (current_count, total_count) for training progress
+    recordingSaved = Signal(str)  # Signal emitted when recording is saved (with filename)
+    recordingFailed = Signal(str)  # Signal emitted when recording could not start (with reason)
+    testResults = Signal(float, float, str)  # Signal (actual_fps, brightness, recommendation)
+    frameReady = Signal()  # Signal emitted when new preview frame is available
+    fpsChanged = Signal(float)  # Smoothed preview FPS (emitted on change > 1 FPS)
+
+    # Recording thread -> GUI thread (queued: emitted off the GUI thread)
+    _recordingStartFailed = Signal(str, str)  # (filepath, reason)
+    _recordingThreadDone = Signal()
+
+    def __init__(self, settings_manager=None, frame_provider=None):
+        super().__init__()
+        self.camera_process = None
+        self.settings_manager = settings_manager
+        self.training_thread = None
+        self.training_active = False
+        self.is_recording = False
+        self._recording_thread = None  # Runs the encoder and feeds the QML preview while recording
+        self._last_recording_seq = -1  # FrameProvider.frame_seq last announced during recording
+        self._recording_finish_pending = False  # stopRecording timed out - finish when the thread exits
+        self.current_recording_path = None
+        self._recordingStartFailed.connect(self._on_recording_start_failed)
+        self._recordingThreadDone.connect(self._on_recording_thread_done)
+        self.frame_provider = frame_provider
+
+        # Shared long-lived Picamera2 for snapshot/training/test (stays open between uses)
+        self._picam2 = None
+        self._camera_key = None  # (mode, frame_rate, shutter, gain) currently configured
+        self._camera_lock = threading.Lock()
+
+        # Preview state (direct Qt rendering)
+        # Capture runs in a separate process (own GIL) - frames arrive via shared memory
+        self.preview_active = False
+        self.preview_process = None
+        self._preview_stop_event = None
+        self._preview_frames = None  # SharedFrameBuffer
+        self._preview_stopping = False
+
+        # GUI-thread timer that pulls new frames from the capture process at the
+        # display refresh rate - frames faster than the panel can show are never copied
+        # Keeps Qt signal dispatch off the capture side
+        screen = QGuiApplication.primaryScreen()
+        refresh_hz = screen.refreshRate() if screen is not None else 0.0
+        if refresh_hz <= 0:
+            refresh_hz = 60.0
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setInterval(max(1, int(1000 / refresh_hz)))
+        self._frame_timer.timeout.connect(self._notify_frame_ready)
+        self._last_notified_seq = 0
+        self._preview_fps = 0.0
+        self._preview_visible = True  # False while QML can't show the preview (screen hidden, app minimized)
+
+    @Property(float, notify=fpsChanged)
+    def previewFps(self):
+        """Smoothed preview capture FPS exposed to QML"""
+        return self._preview_fps
+
+    def _notify_frame_ready(self):
+        """Forward the latest shared-memory frame to QML if it changed (runs on GUI thread)"""
+        if self.is_recording:
+            # The recording thread fills the provider directly - only coalesce the notify
+            seq = self.frame_provider.frame_seq if self.frame_provider is not None else -1
+            if seq != self._last_recording_seq:
+                self._last_recording_seq = seq
+                self.frameReady.emit()
+            return
+
+        if self._preview_frames is None:
+            return
+
+        if self.preview_process is not None and not self.preview_process.is_alive():
+            # Capture process exited on its own (camera error, etc.)
+            print("Preview process exited")
+            self.stopPreview()
+            return
+
+        seq = self._preview_frames.seq
+        if seq != self._last_notified_seq and self.frame_provider is not None and self._preview_visible:
+            self._last_notified_seq = seq
+            try:
+                self.frame_provider.updateFrame(self._preview_frames.acquire_latest())
+            finally:
+                self._preview_frames.release_latest()
+            self.frameReady.emit()  # Signal QML to refresh
+
+        fps = self._preview_frames.fps
+        if abs(fps - self._preview_fps) > 1.0:
+            self._preview_fps = fps
+            self.fpsChanged.emit(fps)
+
+    def _acquire_camera(self, mode, frame_rate, shutter_speed, gain, settle=0.5):
+        """Return the shared Picamera2 configured for mode ("still" or "video")
+
+        The instance stays open between snapshots/training/tests, so repeat
+        operations with unchanged settings skip init, configure and warmup.
+        Changed settings use switch_mode() instead of a full close/reopen.
+        Caller must hold self._camera_lock.
+        """
+        key = (mode, frame_rate, shutter_speed, gain)
+        if self._picam2 is not None and self._camera_key == key:
+            return self._picam2
+
+        if self._picam2 is None:
+            self._picam2 = Picamera2()
+
+        controls = manual_camera_controls(frame_rate, shutter_speed, gain)
+        if mode == "still":
+            config = self._picam2.create_still_configuration(main={"size": (640, 480)}, controls=controls)
+        else:
+            config = self._picam2.create_video_configuration(main={"size": (640, 480)}, controls=controls)
+
+        if self._camera_key is None:
+            self._picam2.configure(config)
+            self._picam2.start()
+        else:
+            self._picam2.switch_mode(config)
+        self._camera_key = key
+
+        time.sleep(settle)  # Let camera stabilize with new settings
+        return self._picam2
+
+    def _close_camera(self):
+        """Stop and close the shared Picamera2 (caller must hold self._camera_lock)"""
+        if self._picam2 is not None:
+            try:
+                self._picam2.stop()
+                self._picam2.close()
+            except Exception as e:
+                print(f"   Warning closing camera: {e}")
+            self._picam2 = None
+            self._camera_key = None
+
+    @Slot()
+    def releaseCamera(self):
+        """Release the shared Picamera2 so the preview/recording/capture can open the camera"""
+        if not self._camera_lock.acquire(blocking=False):
+            print("Camera busy (training/test in progress) - not released")
+            return
+        try:
+            self._close_camera()
+        finally:
+            self._camera_lock.release()
+
+    def _load_preview_settings(self):
+        """Load preview camera settings and pick the frame rate for the resolution/format"""
+        shutter_speed = 8500   # 8.5ms for indoor
+        gain = 5.0             # Good indoor gain
+        frame_rate = 60        # Default preview FPS
+        resolution_str = "320x240"  # Default to high-FPS mode
+        camera_format = "RAW"  # Default to RAW for high FPS
+
+        if self.settings_manager:
+            shutter_speed = int(self.settings_manager.getNumber("cameraShutterSpeed") or 8500)
+            gain = float(self.settings_manager.getNumber("cameraGain") or 5.0)
+            resolution_str = self.settings_manager.getString("cameraResolution") or "320x240"
+            camera_format = self.settings_manager.getString("cameraFormat") or "RAW"
+
+        # Parse resolution string (e.g., "320x240" -> (320, 240))
+        try:
+            width, height = map(int, resolution_str.split('x'))
+            resolution = (width, height)
+        except:
+            print(f"Invalid resolution '{resolution_str}', using 320x240")
+            resolution = (320, 240)
+
+        # Adjust FPS based on resolution and format
+        # RAW format bypasses ISP and allows much higher FPS
+        if camera_format == "RAW":
+            if resolution == (320, 240):
+                frame_rate = 120  # High-speed capture for motion analysis
+            elif resolution == (640, 480):
+                frame_rate = 60   # Moderate speed
+        else:  # YUV420 (ISP processed)
+            if resolution == (320, 240):
+                frame_rate = 60   # ISP-limited
+            elif resolution == (640, 480):
+                frame_rate = 30   # ISP maxes out around 30 FPS
+
+        print(f"Preview settings: Resolution={resolution}, Format={camera_format}, Shutter={shutter_speed}µs, Gain={gain}x, FPS={frame_rate}")
+
+        return {
+            "resolution": resolution,
+            "camera_format": camera_format,
+            "shutter_speed": shutter_speed,
+            "gain": gain,
+            "frame_rate": frame_rate,
+        }
+
+    @Slot()
+    def startPreview(self):
+        """Start high-FPS camera preview with direct Qt rendering (no rpicam-vid lag)"""
+        if not CAMERA_AVAILABLE:
+            print("Camera not available")
+            return
+
+        if self.preview_active:
+            print("Preview already running")
+            return
+
+        if self._preview_stopping:
+            print("Previous preview still stopping - wait a moment")
+            return
+
+        self.releaseCamera()  # Preview process opens its own camera
+
+        settings = self._load_preview_settings()
+        width, height = settings["resolution"]
+
+        ctx = get_context()
+        self._preview_frames = SharedFrameBuffer(ctx, max(width, 640), max(height, 480))
+        self._preview_stop_event = ctx.Event()
+        self._last_notified_seq = 0
+
+        self.preview_active = True
+        self.preview_process = ctx.Process(
+            target=run_preview,
+            args=(settings, self._preview_frames, self._preview_stop_event),
+            daemon=True
+        )
+        self.preview_process.start()
+        self._frame_timer.start()
+        print("🎥 High-FPS preview started (direct Qt rendering, capture process)")
+
+    @Slot(bool)
+    def setPreviewVisible(self, visible):
+        """Skip copying preview frames to the FrameProvider while QML can't show them"""
+        self._preview_visible = visible
+
+    @Slot()
+    def stopPreview(self):
+        """Stop the high-FPS preview"""
+        if not self.preview_active:
+            print("Preview not running")
+            return
+
+        print("Stopping preview...")
+        self._preview_stopping = True
+        self.preview_active = False
+        self._frame_timer.stop()
+
+        # Ask the capture process to stop (it closes its own camera)
+        if self._preview_stop_event is not None:
+            self._preview_stop_event.set()
+
+        # Wait for process
+        if self.preview_process is not None:
+            print("   Waiting for preview process...")
+            self.preview_process.join(timeout=2.0)
+            if self.preview_process.is_alive():
+                print("   Process still running - terminating")
+                self.preview_process.terminate()
+                self.preview_process.join(timeout=1.0)
+            else:
+                print("   Process finished")
+            self.preview_process = None
+
+        self._preview_stop_event = None
+        if self._preview_frames is not None:
+            self._preview_frames.close(unlink=True)
+            self._preview_frames = None
+
+        self._preview_stopping = False
+        print("Preview stopped")
+
+    @Slot()
+    def startCamera(self):
+        """Start the Raspberry Pi camera preview embedded in the UI (OLD - uses rpicam-vid)"""
+        if self.camera_process is not None:
+            print("Camera is already running")
+            return
+
+        self.releaseCamera()  # rpicam needs exclusive camera access
+
+        # Load camera settings from SettingsManager
+        # OPTIMIZED: 45 FPS matches Pi ISP hardware limit (prevents lag)
+        shutter_speed = 10000  # 10ms for indoor lighting
+        gain = 6.0             # Higher gain for indoor
+        ev_compensation = 0.0
+        frame_rate = 45        # Match Pi ISP hardware limit
+
+        if self.settings_manager:
+            shutter_speed = int(self.settings_manager.getNumber("cameraShutterSpeed") or 10000)
+            gain = float(self.settings_manager.getNumber("cameraGain") or 6.0)
+            ev_compensation = float(self.settings_manager.getNumber("cameraEV") or 0.0)
+            frame_rate = int(self.settings_manager.getNumber("cameraFrameRate") or 45)
+            time_of_day = self.settings_manager.getString("cameraTimeOfDay") or "Cloudy/Shade"
+            print(f"Camera settings: {time_of_day} | Shutter: {shutter_speed}µs | Gain: {gain}x | EV: {ev_compensation:+.1f} | FPS: {frame_rate}")
+
+        try:
+            # Camera preview embedded in the black rectangle area
+            # Window is frameless at (0,0), so coordinates match QML layout exactly
+            # x=22 (margin+border), y=82 (margin 20 + header 48 + spacing 12 + border 2), width=756, height=254
+            print("🎥 Starting embedded camera preview...")
+
+            # Build command with camera settings
+            cmd = [
+                'rpicam-vid',
+                '--timeout', '0',                # Run indefinitely
+                '--width', '640',                # Camera resolution
+                '--height', '480',
+                '--framerate', str(frame_rate),  # Frames per second
+                '--preview', '22,82,756,254',    # x,y,width,height - matches black rectangle exactly
+                '--shutter', str(shutter_speed), # Exposure time in microseconds
+                '--gain', str(gain),             # Analog gain
+                '--ev', str(ev_compensation),    # Exposure compensation in stops
+                '--awb', 'auto'                  # Auto white balance
+            ]
+
+            self.camera_process = self._spawn_rpicam(cmd)
+            print("Camera started successfully")
+        except FileNotFoundError:
+            try:
+                # Fallback to rpicam-hello with same embedded settings
+                print("🎥 Starting camera with rpicam-hello...")
+                cmd = [
+                    'rpicam-hello',
+                    '--timeout', '0',
+                    '--width', '640',
+                    '--height', '480',
+                    '--framerate', str(frame_rate),
+                    '--preview', '22,82,756,254',
+                    '--shutter', str(shutter_speed),
+                    '--gain', str(gain),
+                    '--ev', str(ev_compensation)
+                ]
+                self.camera_process = self._spawn_rpicam(cmd)
+                print("Camera started successfully")
+            except FileNotFoundError:
+                print("Camera tools not found. Install with: sudo apt install rpicam-apps")
+                self.camera_process = None
+        except Exception as e:
+            print(f"Failed to start camera: {e}")
+            self.camera_process = None
+
+    def _spawn_rpicam(self, cmd):
+        """Start an rpicam-* child detached from the app's TTY, session and fds
+
+        rpicam-vid prints per-frame stats; writing them to the tty can back-pressure
+        its encoder loop, so output goes to /dev/null unless PRGR_DEBUG is set.
+        """
+        output = None if DEBUG else subprocess.DEVNULL
+        return subprocess.Popen(
+            cmd,
+            stdout=output,
+            stderr=output,
+            close_fds=True,           # Don't leak Qt sockets/fds into the child
+            start_new_session=True    # Ctrl+C on the app doesn't tear down the child
+        )
+
+    def _stop_process(self, process, timeout):
+        """Stop an rpicam-* child with SIGINT, polling for exit; kill only if it hangs
+
+        rpicam-vid handles SIGINT by cleanly closing its output (<100ms typical),
+        so a tight poll returns as soon as it exits instead of a coarse wait.
+        Returns True if the process exited gracefully.
+        """
+        process.send_signal(signal.SIGINT)
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            if process.poll() is not None:
+                return True
+            time.sleep(0.001)
+
+        process.kill()
+        process.wait()
+        return False
+
+    @Slot()
+    def stopCamera(self):
+        """Stop the camera preview"""
+        if self.camera_process is not None:
+            print("Stopping camera...")
+            self._stop_process(self.camera_process, timeout=2.0)
+            self.camera_process = None
+            print("Camera stopped")
+        else:
+            print("Camera is not running")
+
+    @Slot()
+    def takeSnapshot(self):
+        """Capture a single frame and save to BallSnapshotTest folder"""
+        # Create BallSnapshotTest folder if it doesn't exist
+        snapshot_folder = "BallSnapshotTest"
+        os.makedirs(snapshot_folder, exist_ok=True)
+
+        # Generate filename with timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"snapshot_{timestamp}.jpg"
+        filepath = os.path.join(snapshot_folder, filename)
+
+        print(f"📸 Taking snapshot...")
+
+        # Remember if preview was running
+        preview_was_running = self.camera_process is not None
+
+        try:
+            if not CAMERA_AVAILABLE:
+                print("Camera not available - cannot take snapshot")
+                return
+
+            # Load camera settings - optimized for Pi ISP limit + indoor
+            shutter_speed = 10000  # 10ms for indoor
+            gain = 6.0             # Higher gain for brightness
+            frame_rate = 45        # Match hardware limit
+            ev_compensation = 0.0
+
+            if self.settings_manager:
+                shutter_speed = int(self.settings_manager.getNumber("cameraShutterSpeed") or 10000)
+                gain = float(self.settings_manager.getNumber("cameraGain") or 6.0)
+                frame_rate = int(self.settings_manager.getNumber("cameraFrameRate") or 45)
+                ev_compensation = float(self.settings_manager.getNumber("cameraEV") or 0.0)
+
+            # Stop camera preview if running (to release camera)
+            if preview_was_running:
+                print("   Stopping preview to release camera...")
+                self.stopCamera()
+                time.sleep(1)  # Give camera time to fully release
+
+            # Capture a single frame on the shared Picamera2 (no re-init if already open)
+            # Don't block the GUI thread behind a running training session/test
+            if not self._camera_lock.acquire(blocking=False):
+                print("Camera busy (training/test in progress) - cannot take snapshot")
+                return
+            try:
+                picam2 = self._acquire_camera("still", frame_rate, shutter_speed, gain)
+                picam2.capture_file(filepath)
+            except Exception:
+                self._close_camera()
+                raise
+            finally:
+                self._camera_lock.release()
+
+            print(f"Snapshot saved: {filepath}")
+            self.snapshotSaved.emit(filename)
+
+        except Exception as e:
+            print(f"Failed to take snapshot: {e}")
+
+        finally:
+            # Restart preview if it was running before
+            if preview_was_running:
+                print("   Restarting preview...")
+                time.sleep(0.5)  # Brief pause before restarting
+                self.startCamera()
+
+    @Slot(int)
+    def startTrainingMode(self, num_frames=100):
+        """
+        Rapid capture mode for collecting ML training data
+        Captures num_frames images as fast as the camera and SD card allow
+        """
+        if self.training_active:
+            print("Training mode already running")
+            return
+
+        if not CAMERA_AVAILABLE:
+            print("Camera not available")
+            return
+
+        self.training_active = True
+        self.training_thread = threading.Thread(
+            target=self._training_capture_loop,
+            args=(num_frames,),
+            daemon=True
+        )
+        self.training_thread.start()
+        print(f"🎓 Training mode started - will capture {num_frames} frames")
+
+    def _training_capture_loop(self, num_frames):
+        """Background thread for rapid training data capture"""
+        # Create training data folder with timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        training_folder = f"training_data/session_{timestamp}"
+        os.makedirs(training_folder, exist_ok=True)
+
+        # Create metadata file
+        metadata_path = os.path.join(training_folder, "metadata.txt")
+
+        # Remember if preview was running
+        preview_was_running = self.camera_process is not None
+
+        try:
+            # Load camera settings - optimized for Pi ISP limit + indoor
+            shutter_speed = 10000  # 10ms for indoor
+            gain = 6.0             # Higher gain for brightness
+            frame_rate = 45        # Match hardware limit
+
+            if self.settings_manager:
+                shutter_speed = int(self.settings_manager.getNumber("cameraShutterSpeed") or 10000)
+                gain = float(self.settings_manager.getNumber("cameraGain") or 6.0)
+                frame_rate = int(self.settings_manager.getNumber("cameraFrameRate") or 45)
+
+            # Write metadata
+            with open(metadata_path, 'w') as f:
+                f.write(f"Training Session: {timestamp}\n")
+                f.write(f"Camera Settings:\n")
+                f.write(f"  Shutter: {shutter_speed}µs\n")
+                f.write(f"  Gain: {gain}x\n")
+                f.write(f"  Frame Rate: {frame_rate} FPS\n")
+                f.write(f"  Target Frames: {num_frames}\n\n")
+                f.write(f"Instructions for labeling:\n")
+                f.write(f"1. Use Roboflow or LabelImg to label images\n")
+                f.write(f"2. Classes: ball_stationary, ball_moving, club_stationary, club_swinging\n")
+                f.write(f"3. Export in YOLO format for training\n\n")
+
+            # Stop preview if running
+            if preview_was_running:
+                self.stopCamera()
+                time.sleep(1)
+
+            # JPEG encode + file write happen on writer threads, off the capture path
+            # Two writers: cv2.imencode releases the GIL, so encodes overlap on two cores
+            # Bounded queue: put() blocks when the writers fall 16 frames behind, so
+            # capture runs as fast as the SD card can absorb (natural backpressure)
+            write_queue = queue.Queue(maxsize=16)
+            writer_threads = [threading.Thread(target=self._training_writer, args=(write_queue,), daemon=True)
+                              for _ in range(2)]
+            for writer_thread in writer_threads:
+                writer_thread.start()
+
+            # Pin only now - threads inherit the creator's CPU mask and scheduling
+            # policy, so the writers above stay on the non-camera cores at normal priority
+            pin_capture_thread()
+
+            with self._camera_lock:
+                try:
+                    # Shared camera instance (no re-init if already open with these settings)
+                    picam2 = self._acquire_camera("still", frame_rate, shutter_speed, gain)
+
+                    print(f"📸 Capturing {num_frames} training frames...")
+
+                    # Capture frames
+                    for i in range(num_frames):
+                        if not self.training_active:
+                            print("Training mode cancelled")
+                            break
+
+                        filename = f"frame_{i:04d}.jpg"
+                        filepath = os.path.join(training_folder, filename)
+
+                        # Camera-driven: blocks until the next buffer arrives, no fixed sleep
+                        request = picam2.capture_request()
+                        try:
+                            frame = request.make_array("main")  # Copy - buffer goes straight back
+                        finally:
+                            request.release()
+                        write_queue.put((filepath, frame))
+
+                        # Emit progress
+                        self.trainingModeProgress.emit(i + 1, num_frames)
+
+                        # Log every 10 frames
+                        if DEBUG and (i + 1) % 10 == 0:
+                            print(f"   Captured {i + 1}/{num_frames} frames...")
+                except Exception:
+                    self._close_camera()
+                    raise
+                finally:
+                    # Flush remaining frames to disk (one sentinel per writer)
+                    for _ in writer_threads:
+                        write_queue.put(None)
+                    for writer_thread in writer_threads:
+                        writer_thread.join()
+
+            print(f"Training data captured: {training_folder}")
+            print(f"   Next steps:")
+            print(f"   1. Label images in Roboflow (https://roboflow.com)")
+            print(f"   2. Export in YOLO format")
+            print(f"   3. Train YOLOv8 model on Google Colab")
+
+        except Exception as e:
+            print(f"Training capture error: {e}")
+
+        finally:
+            # Restart preview if it was running
+            if preview_was_running:
+                time.sleep(0.5)
+                self.startCamera()
+
+            self.training_active = False
+            self.training_thread = None
+            self.trainingModeProgress.emit(num_frames, num_frames)  # Signal completion
+
+    def _training_writer(self, write_queue):
+        """Writer thread: JPEG-encode and save queued training frames until a None sentinel
+
+        Several writers may share one queue - each exits on its own sentinel.
+        """
+        while True:
+            item = write_queue.get()
+            if item is None:
+                return
+
+            filepath, frame = item
+            try:
+                if len(frame.shape) == 3 and frame.shape[2] == 3:
+                    # Picamera2 BGR888 arrays are ordered [R, G, B] - convert for OpenCV
+                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                elif len(frame.shape) == 3 and frame.shape[2] == 4:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR)
+                ok, jpeg = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+                if not ok:
+                    raise RuntimeError("JPEG encode failed")
+                with open(filepath, "wb") as f:
+                    f.write(jpeg.tobytes())
+                    f.flush()
+                    self._drop_file_cache(f.fileno())
+            except Exception as e:
+                print(f"Failed to write training frame {filepath}: {e}")
+
+    def _drop_file_cache(self, fd):
+        """Tell the kernel not to keep a written file in the page cache
+
+        Write-once capture files (training JPEGs, recordings) would otherwise evict
+        the app's working set on the Pi. DONTNEED also starts writeback of dirty pages.
+        """
+        if hasattr(os, "posix_fadvise"):
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            except OSError:
+                pass  # Advisory only
+
+    def _recording_cache_dropper(self, filepath):
+        """Background thread: periodically drop the growing recording file from page cache"""
+        while self.is_recording and self.current_recording_path == filepath:
+            time.sleep(1.0)
+            try:
+                fd = os.open(filepath, os.O_RDONLY)
+            except OSError:
+                continue  # Output file not created yet
+            try:
+                self._drop_file_cache(fd)
+            finally:
+                os.close(fd)
+
+    @Slot()
+    def stopTrainingMode(self):
+        """Stop training mode capture"""
+        if self.training_active:
+            print("Stopping training mode...")
+            self.training_active = False
+
+    @Slot()
+    def startRecording(self):
+        """Start recording video to file"""
+        if self.is_recording:
+            print("Already recording")
+            return
+        if self._recording_finish_pending:
+            print("Previous recording still finalizing - try again shortly")
+            return
+
+        # Create Videos folder if it doesn't exist
+        videos_folder = "Videos"
+        os.makedirs(videos_folder, exist_ok=True)
+
+        # Generate filename with timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"video_{timestamp}.mp4"  # MP4 for smooth playback
+        filepath = os.path.join(videos_folder, filename)
+        self.current_recording_path = filepath
+
+        # Load camera settings - optimized for Pi ISP limit + indoor
+        shutter_speed = 10000  # 10ms for indoor
+        gain = 6.0             # Higher gain for brightness
+        frame_rate = 45        # Match hardware limit
+
+        if self.settings_manager:
+            shutter_speed = int(self.settings_manager.getNumber("cameraShutterSpeed") or 10000)
+            gain = float(self.settings_manager.getNumber("cameraGain") or 6.0)
+            frame_rate = int(self.settings_manager.getNumber("cameraFrameRate") or 45)
+
+        # Calculate bitrate (optimized for Pi 4B hardware decoding)
+        # 5 Mbps for 640x480 @ 45 FPS = smooth playback + excellent quality
+        bitrate = 5000000  # 5 Mbps (Pi 4B sweet spot)
+
+        if not CAMERA_AVAILABLE:
+            print("Camera not available")
+            return
+
+        try:
+            print(f"Starting video recording: {filename}")
+
+            # Stop NEW high-FPS preview if running (Picamera2)
+            if self.preview_active:
+                print("Stopping preview before recording...")
+                self.stopPreview()
+                time.sleep(0.5)
+
+            # Stop OLD camera preview if running (rpicam-apps)
+            if self.camera_process is not None:
+                self.stopCamera()
+                time.sleep(0.5)
+
+            # Camera acquisition (open/configure/settle) and encoder start run on the
+            # recording thread, so the UI never blocks on them
+            self.is_recording = True
+            self._recording_thread = threading.Thread(
+                target=self._recording_worker,
+                args=(filepath, frame_rate, shutter_speed, gain, bitrate),
+                daemon=True
+            )
+            self._recording_thread.start()
+
+            # The GUI timer coalesces frameReady for the recording preview
+            self._last_recording_seq = -1
+            self._frame_timer.start()
+
+        except Exception as e:
+            print(f"Failed to start recording: {e}")
+            self.is_recording = False
+            self.current_recording_path = None
+
+    def _recording_worker(self, filepath, frame_rate, shutter_speed, gain, bitrate):
+        """Recording thread: start the encoder, feed the preview, stop the encoder
+
+        Records on the shared long-lived Picamera2 - no rpicam-vid fork/exec and no
+        fresh CMA buffer set. Runs until stopRecording() clears is_recording.
+        """
+        if not self._camera_lock.acquire(blocking=False):
+            print("Camera busy (training/test in progress) - cannot record")
+            self.is_recording = False
+            self._recordingStartFailed.emit(filepath, "Camera busy")
+            return
+
+        try:
+            try:
+                picam2 = self._acquire_camera("video", frame_rate, shutter_speed, gain)
+
+                # Hardware H.264, keyframe every 1 second for smooth seeking,
+                # muxed to MP4 by FfmpegOutput for smooth playback
+                encoder = H264Encoder(bitrate=bitrate, iperiod=frame_rate)
+                picam2.start_encoder(encoder, FfmpegOutput(filepath))
+            except Exception as e:
+                print(f"Failed to start recording: {e}")
+                self._close_camera()
+                self.is_recording = False
+                self._recordingStartFailed.emit(filepath, str(e))
+                return
+
+            print(f"Recording started: {filepath}")
+
+            # Keep the H.264 output from filling the page cache while recording
+            threading.Thread(target=self._recording_cache_dropper, args=(filepath,), daemon=True).start()
+
+            # Show the recording camera's frames in the QML preview while recording
+            # (provider only - the GUI timer emits frameReady at display rate)
+            while self.is_recording:
+                try:
+                    frame = picam2.capture_array("main")
+                except Exception as e:
+                    print(f"Recording preview error: {e}")
+                    break
+                if self.frame_provider is not None and self._preview_visible:
+                    self.frame_provider.updateFrame(frame)
+
+            # stop_encoder() flushes the encoder and lets ffmpeg finalize the MP4 container
+            try:
+                picam2.stop_encoder()
+                print("Recording stopped gracefully")
+            except Exception as e:
+                print(f"Error stopping encoder: {e}")
+                self._close_camera()
+        finally:
+            self._camera_lock.release()
+            self._recordingThreadDone.emit()
+
+    @Slot(str, str)
+    def _on_recording_start_failed(self, filepath, reason):
+        """Undo startRecording after the recording thread failed to start (GUI thread)"""
+        if filepath != self.current_recording_path:
+            return  # A newer recording has started since
+        self._frame_timer.stop()
+        self.current_recording_path = None
+        self.recordingFailed.emit(reason)
+
+    @Slot()
+    def _on_recording_thread_done(self):
+        """Finish a stopRecording() that timed out once the thread has released the camera"""
+        if not self._recording_finish_pending:
+            return
+        self._recording_finish_pending = False
+        self._recording_thread = None
+        self._finish_recording()
+
+    @Slot()
+    def stopRecording(self):
+        """Stop recording and save video"""
+        if not self.is_recording:
+            print("Not currently recording")
+            return
+
+        try:
+            print("Stopping recording...")
+            self.is_recording = False
+            self._frame_timer.stop()
+
+            # The recording thread stops the encoder (finalizing the MP4) and releases the camera
+            if self._recording_thread is not None:
+                self._recording_thread.join(timeout=5.0)
+                if self._recording_thread.is_alive():
+                    # Still holds the camera - restarting the preview now could not open it
+                    print("Timeout waiting for recording to stop - finishing when it exits")
+                    self._recording_finish_pending = True
+                    return
+                self._recording_thread = None
+
+            self._finish_recording()
+
+        except Exception as e:
+            print(f"Error stopping recording: {e}")
+            self.is_recording = False
+            self.current_recording_path = None
+
+    def _finish_recording(self):
+        """Report the saved file and bring the preview back (recording thread has exited)"""
+        try:
+            if self.current_recording_path and os.path.exists(self.current_recording_path):
+                # Get file size for confirmation
+                file_size = os.path.getsize(self.current_recording_path) / (1024 * 1024)  # MB
+                print(f"Recording saved: {self.current_recording_path} ({file_size:.1f} MB)")
+                self.recordingSaved.emit(os.path.basename(self.current_recording_path))
+            else:
+                print(f"Warning: Recording file not found: {self.current_recording_path}")
+
+            self.current_recording_path = None
+
+            # Restart preview after recording (if it was running before)
+            # User likely wants to see the preview again
+            print("Restarting preview after recording...")
+            self.startPreview()
+
+        except Exception as e:
+            print(f"Error finishing recording: {e}")
+            self.current_recording_path = None
+
+    @Slot(int, int, float)
+    def testCameraSettings(self, fps, shutter, gain):
+        """Test camera performance with given settings"""
+        if not CAMERA_AVAILABLE:
+            self.testResults.emit(0, 0, "Camera not available on this system")
+            return
+
+        def run_test():
+            try:
+                print(f"🧪 Testing camera: {fps} FPS, {shutter}µs shutter, {gain}x gain")
+
+                with self._camera_lock:
+                    try:
+                        # Shared camera instance, 1s warmup only when (re)configured
+                        picam2 = self._acquire_camera("video", fps, shutter, gain, settle=1.0)
+
+                        # Measure actual FPS over 5 seconds
+                        frame_count = 0  # Frames captured (O(1) state - no per-frame list/deque)
+                        brightness_total = 0.0  # Running sum of per-frame mean brightness
+                        brightness_samples = 0  # Number of frames measured
+                        start_time = time.perf_counter()
+                        last_time = start_time
+
+                        while last_time - start_time < 5.0:
+                            frame = picam2.capture_array()
+                            last_time = time.perf_counter()
+                            frame_count += 1
+
+                            # Measure brightness on every 8th row/column - 64x fewer pixels,
+                            # same mean to well under 1% for a camera image; cv2.mean is a
+                            # single SIMD pass (no float promotion, no intermediate gray array)
+                            channel_means = cv2.mean(np.ascontiguousarray(frame[::8, ::8]))
+                            channels = min(frame.shape[2], 3) if len(frame.shape) == 3 else 1  # Ignore X/alpha
+                            brightness_total += sum(channel_means[:channels]) / channels
+                            brightness_samples += 1
+                    except Exception:
+                        self._close_camera()
+                        raise
+
+                # Calculate results (real elapsed time, not the nominal 5s window)
+                elapsed = last_time - start_time
+                actual_fps = frame_count / elapsed if elapsed > 0 else 0.0
+                avg_brightness = brightness_total / max(brightness_samples, 1) / 255.0 * 100  # As percentage
+
+                # Generate recommendation
+                recommendation = ""
+
+                # FPS Analysis
+                if actual_fps >= 42:
+                    recommendation += f"✓ Good FPS: {actual_fps:.0f} FPS\n"
+                    recommendation += "NOTE: ~45 FPS is the practical maximum\n"
+                    recommendation += "with this resolution due to Pi ISP limits.\n"
+                else:
+                    recommendation += f"Low FPS: {actual_fps:.0f} FPS\n"
+                    recommendation += "• System struggling - reduce load\n"
+
+                # Brightness Analysis
+                if avg_brightness < 20:
+                    recommendation += "\nImage too dark\n"
+                    recommendation += "• Increase gain or shutter speed\n"
+                    recommendation += "• Add more lighting\n"
+                elif avg_brightness > 80:
+                    recommendation += "\nImage too bright\n"
+                    recommendation += "• Decrease gain or shutter speed\n"
+                else:
+                    recommendation += f"\n✓ Good brightness: {avg_brightness:.0f}%\n"
+
+                # Specific recommendations
+                if avg_brightness < 30:
+                    recommendation += "\n💡 For indoor: Try Gain 7.0x, Shutter 12ms"
+                elif avg_brightness > 60:
+                    recommendation += "\n💡 For bright conditions: Gain 3.0x, Shutter 5ms"
+
+                # Reality check
+                if actual_fps < 40:
+                    recommendation += "\n\nPERFORMANCE ISSUE:"
+                    recommendation += "\n• Close other programs"
+                    recommendation += "\n• Reduce system load"
+                    recommendation += "\n• Check CPU temperature"
+
+                print(f"Test complete: {actual_fps:.1f} FPS, {avg_brightness:.1f}% brightness")
+                print(f"   NOTE: RPi ISP limits 640x480 to ~45 FPS max")
+                self.testResults.emit(actual_fps, avg_brightness, recommendation)
+
+            except Exception as e:
+                error_msg = f"Test failed: {str(e)}\n\nMake sure camera is not in use by another process."
+                print(f"{error_msg}")
+                self.testResults.emit(0, 0, error_msg)
+
+        # Run test in background thread
+        test_thread = threading.Thread(target=run_test, daemon=True)
+        test_thread.start()
+
+    def __del__(self):
+        """Cleanup on destruction"""
+        self.stopCamera()
+        self.releaseCamera()
+        if self.is_recording:
+            self.stopRecording()
+
+# ============================================
+# Rolling Median (radius smoothing)
+# ============================================
+class RollingMedian:
+    """Sliding-window median over the last maxlen values
+
+    Keeps a sorted copy of the window next to the deque (bisect insert/remove),
+    so the median is an index lookup - no np.median allocation/sort per frame.
+    """
+
+    def __init__(self, maxlen):
+        self._values = deque(maxlen=maxlen)
+        self._sorted = []
+
+    def __len__(self):
+        return len(self._values)
+
+    def append(self, value):
+        if len(self._values) == self._values.maxlen:
+            evicted = self._values[0]  # deque drops this one on append
+            del self._sorted[bisect.bisect_left(self._sorted, evicted)]
+        self._values.append(value)
+        bisect.insort(self._sorted, value)
+
+    def clear(self):
+        self._values.clear()
+        self._sorted.clear()
+
+    def median(self):
+        """Median of the window (mean of the two middle values for an even count, like np.median)"""
+        n = len(self._sorted)
+        mid = n // 2
+        if n % 2:
+            return self._sorted[mid]
+        return (self._sorted[mid - 1] + self._sorted[mid]) / 2
+
+
+# ============================================
+# Capture Manager Class
+# ============================================
+class CaptureManager(QObject):
+    """Manages automatic ball capture with motion detection"""
+
+    # Signals to update UI
+    statusChanged = Signal(str, str)  # (status, color) - e.g. ("Ball Locked", "green")
+    shotCaptured = Signal(int)  # shot_number
+    errorOccurred = Signal(str)  # error_message
+    replayReady = Signal(str)  # gif_filepath - emitted when replay GIF is ready to display in popup
+
+    def __init__(self, settings_manager=None, camera_manager=None, kld2_manager=None):
+        super().__init__()
+        self.settings_manager = settings_manager
+        self.camera_manager = camera_manager
+        self.kld2_manager = kld2_manager
+        self.is_running = False
+        self.capture_thread = None
+        self.picam2 = None  # Store camera instance for cleanup
+        self._stopping = False  # Flag to track if we're in the process of stopping
+
+        # K-LD2 detection trigger state
+        self.kld2_triggered = False  # Legacy flag - set when club approaches
+        self.kld2_impact_detected = False  # NEW flag - set when radar confirms impact (speed drop)
+        self.use_kld2_trigger = True  # Set to True to use K-LD2, False for camera-based
+        self.waiting_for_impact = False  # True when club detected, waiting to confirm ball moved
+
+        # Edge velocity tracking state
+        self.prev_gray = None  # Previous frame for optical flow
+        self.ball_motion_history = deque(maxlen=10)  # Track ball velocity over time
+
+        # HoughCircles param2 that last produced a usable result (tried first next frame)
+        self._last_param2 = None
+
+        # Reusable detection objects (avoid re-allocating C++ objects every frame)
+        if CAMERA_AVAILABLE:
+            self._clahe = cv2.createCLAHE(clipLimit=6.0, tileGridSize=(6, 6))
+            self._morph_kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (5, 5))
+
+            # Blob detector for the locked-ball fast path (bright, round blob of ball size)
+            blob_params = cv2.SimpleBlobDetector_Params()
+            blob_params.minThreshold = 127        # Input is already a binary mask
+            blob_params.maxThreshold = 128
+            blob_params.filterByColor = True
+            blob_params.blobColor = 255
+            blob_params.filterByArea = True
+            blob_params.minArea = np.pi * 16 ** 2  # Ball radius 20-100px (+/-20%)
+            blob_params.maxArea = np.pi * 120 ** 2
+            blob_params.filterByCircularity = True
+            blob_params.minCircularity = 0.7
+            blob_params.filterByInertia = False
+            blob_params.filterByConvexity = False
+            self._blob = cv2.SimpleBlobDetector_create(blob_params)
+
+        # Replay GIF encoding runs in a worker process (CPU-bound LZW, off the capture thread)
+        # Spawned: the worker imports only main.py (a bare launcher) and replay_worker
+        self._gif_pool = ProcessPoolExecutor(max_workers=1, mp_context=get_context())
+
+        # Replay files (MP4 + GIF submit) are written by a worker thread, off the capture path
+        self._replay_queue = queue.Queue()
+        self._replay_thread = None
+
+        # Last status emitted by the capture loop (see _set_status)
+        self._last_status = None
+
+        # Preallocated per-frame scratch buffers (see _scratch)
+        self._scratch_buffers = {}
+
+        # Connect K-LD2 signals if available
+        if self.kld2_manager:
+            # Legacy signal (club approaching)
+            self.kld2_manager.detectionTriggered.connect(self._on_kld2_club_detected)
+            # NEW signal (impact confirmed by radar)
+            self.kld2_manager.impactDetected.connect(self._on_kld2_impact)
+
+    def _on_kld2_club_detected(self):
+        """Handle K-LD2 club detection signal (club approaching - swing starting)"""
+        print("⛳ K-LD2: Club approaching - monitoring for impact...")
+        self.kld2_triggered = True
+        self.waiting_for_impact = True  # Start monitoring camera for ball movement
+
+    def _on_kld2_impact(self):
+        """Handle K-LD2 impact detection signal (club passed through - speed dropped)"""
+        print("🏌️ K-LD2: Impact timing detected - verifying ball movement with camera...")
+        self.kld2_impact_detected = True
+
+    def _capture_frame(self, copy=False):
+        """Capture frame from correct stream (lores for RAW, main for YUV) and convert to grayscale
+
+        The frame is copied straight out of the camera buffer into a reused array,
+        so it is only valid until the next call - pass copy=True to keep it.
+        Bayer RAW frames are converted to gray directly from the mapped buffer.
+        """
+        use_lores = hasattr(self, 'use_lores_stream') and self.use_lores_stream
+        stream = "lores" if use_lores else "main"  # lores: direct sensor data - bypasses ISP!
+
+        request = self.picam2.capture_request()
+        try:
+            with MappedArray(request, stream) as mapped:
+                frame = mapped.array
+
+                # lores (and the YUV main stream) output YUV420 format (even for monochrome camera)
+                # YUV420 stacks Y, U, V planes vertically: (height*1.5, width)
+                if hasattr(self, 'capture_resolution') and len(frame.shape) == 2:
+                    width, height = self.capture_resolution  # e.g., (320, 240)
+
+                    # Check if this is YUV420 format: frame height = resolution height × 1.5
+                    if frame.shape[0] == height * 3 // 2:  # YUV420 detected
+                        # Extract Y channel (first 'height' rows) - the mapped buffer is laid
+                        # out by stride, so crop the row padding too (still a zero-copy view)
+                        # For 320×240: extract rows 0-239 from (360, stride) frame
+                        frame = frame[:height, :width]
+
+                if frame.dtype == np.uint16:
+                    # Bayer RAW - debayer straight out of the camera buffer; the
+                    # result is a new array, so no intermediate copy is needed
+                    return self._convert_bayer_to_gray(frame)
+
+                if copy:
+                    return frame.copy()
+
+                buffer = self._scratch("capture", frame.shape, frame.dtype)
+                np.copyto(buffer, frame)
+                return buffer
+        finally:
+            request.release()
+
+    @Slot()
+    def startCapture(self):
+        """Start the capture process in a background thread"""
+        if not CAMERA_AVAILABLE:
+            self.errorOccurred.emit("Camera not available on this system")
+            return
+
+        if self.is_running:
+            print("Capture already running")
+            return
+
+        # Safety check - stopCapture should have cleared these
+        if self._stopping or self.capture_thread is not None:
+            print("Previous capture cleanup incomplete - forcing reset")
+            self._stopping = False
+            self.capture_thread = None
+
+        # Stop camera preview if it's running
+        if self.camera_manager:
+            print("Stopping camera preview before capture...")
+            self.camera_manager.stopCamera()
+            self.camera_manager.releaseCamera()
+            time.sleep(1)  # Give camera time to release
+
+        # Start K-LD2 sensor for speed and detection
+        if self.kld2_manager and self.use_kld2_trigger:
+            print("Starting K-LD2 radar sensor...")
+            if not self.kld2_manager.start():
+                print("Warning: K-LD2 failed to start - using camera-based detection")
+                self.use_kld2_trigger = False
+
+        # Start replay writer (keeps finishing queued shots even across stop/start)
+        if self._replay_thread is None or not self._replay_thread.is_alive():
+            self._replay_thread = threading.Thread(target=self._replay_worker, daemon=True)
+            self._replay_thread.start()
+
+        self.is_running = True
+        self.kld2_triggered = False  # Reset trigger flag
+        self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self.capture_thread.start()
+        print("🎥 Capture started", flush=True)
+
+    @Slot()
+    def stopCapture(self):
+        """Stop the capture process and wait for cleanup"""
+        print("Stopping capture...")
+        self._stopping = True
+        self.is_running = False
+
+        # Stop K-LD2 sensor
+        if self.kld2_manager and self.use_kld2_trigger:
+            print("Stopping K-LD2...")
+            self.kld2_manager.stop()
+
+        # Stop camera if running
+        if self.picam2 is not None:
+            try:
+                self.picam2.stop()
+                self.picam2.close()
+                print("   Camera stopped and closed")
+            except Exception as e:
+                print(f"   Warning stopping camera: {e}")
+            self.picam2 = None
+
+        # Let the replay writer finish queued shots, then exit
+        if self._replay_thread is not None:
+            self._replay_queue.put(None)
+            self._replay_thread = None
+
+        # Wait for background thread to finish (with timeout)
+        if self.capture_thread is not None:
+            print("   Waiting for capture thread to finish...")
+            thread = self.capture_thread  # Store reference before clearing
+            self.capture_thread = None  # Clear immediately to prevent double-stop
+            thread.join(timeout=2.0)  # Wait up to 2 seconds
+            if thread.is_alive():
+                print("   Thread still running after timeout (will exit naturally)")
+            else:
+                print("   Thread finished")
+
+        # Clear stopping flag immediately after cleanup attempt
+        self._stopping = False
+
+        self.statusChanged.emit("Stopped", "gray")
+        print("Capture stopped")
+
+    def _scratch(self, name, shape, dtype=np.uint8):
+        """Return a reusable buffer, reallocated only when the frame shape changes"""
+        buf = self._scratch_buffers.get(name)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._scratch_buffers[name] = buf
+        return buf
+
+    def _save_frame(self, filename, frame):
+        """Save frame to file, handling all image formats (grayscale, RGB, RGBA)"""
+        if len(frame.shape) == 3:
+            if frame.shape[2] == 1:
+                # Single channel (native Y) - squeeze to 2D
+                cv2.imwrite(filename, frame[:, :, 0])
+            elif frame.shape[2] == 4:
+                # 4-channel (RGBA/BGRA) - convert to BGR
+                cv2.imwrite(filename, cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR))
+            elif frame.shape[2] == 3:
+                # 3-channel (RGB) - convert to BGR
+                cv2.imwrite(filename, cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+        else:
+            # Already 2D grayscale
+            cv2.imwrite(filename, frame)
+
+    def _detect_club_behind_ball(self, frame, ball_position):
+        """Detect if club head is positioned behind the ball
+
+        Looks for a large, elongated object (club head) behind the ball position.
+        Returns True if club is detected, False otherwise.
+        """
+        if ball_position is None:
+            return False
+
+        # Convert to grayscale
+        if len(frame.shape) == 3:
+            if frame.shape[2] == 1:
+                gray = frame[:, :, 0]
+            elif frame.shape[2] == 4:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+            elif frame.shape[2] == 3:
+                gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = frame
+
+        ball_x, ball_y, ball_r = int(ball_position[0]), int(ball_position[1]), int(ball_position[2])
+
+        # Define region behind ball (to the left, assuming right-handed golfer)
+        # Look in area: x-200 to x-50, y-100 to y+100
+        x1 = max(0, ball_x - 200)
+        x2 = max(0, ball_x - 50)
+        y1 = max(0, ball_y - 100)
+        y2 = min(gray.shape[0], ball_y + 100)
+
+        if x2 <= x1 or y2 <= y1:
+            return False
+
+        region = gray[y1:y2, x1:x2]
+
+        # Look for edges (club head has distinct edges)
+        edges = cv2.Canny(region, 50, 150)
+
+        # Count edge pixels - club head should have significant edges
+        edge_pixels = np.count_nonzero(edges)
+        edge_density = edge_pixels / (region.shape[0] * region.shape[1])
+
+        # If edge density is high enough, club is likely present
+        # Lowered to 10% for faster detection - we want to catch the club quickly
+        return edge_density > 0.10  # 10% of region has edges
+
+    def _detect_club_near_ball(self, frame, ball_position):
+        """Detect club movement NEAR the ball from ANY direction (for downswing detection)
+
+        This is more permissive than _detect_club_behind_ball because during the downswing,
+        the club is moving fast and may approach from various angles.
+
+        Uses real-world measurements: 12-inch box around the ball (6 inches left/right).
+        Uses LOWER threshold to catch fast-moving clubs.
+        """
+        if ball_position is None:
+            return False
+
+        # Convert to grayscale
+        if len(frame.shape) == 3:
+            if frame.shape[2] == 1:
+                gray = frame[:, :, 0]
+            elif frame.shape[2] == 4:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+            elif frame.shape[2] == 3:
+                gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+        else:
+            gray = frame
+
+        ball_x, ball_y, ball_r = int(ball_position[0]), int(ball_position[1]), int(ball_position[2])
+
+        # Calculate pixels per inch from ball radius
+        # Golf ball radius = 0.84 inches (diameter 1.68")
+        pixels_per_inch = ball_r / 0.84
+
+        # 12-inch detection box: 6 inches left and right of ball
+        horizontal_range = int(6.0 * pixels_per_inch)
+        # Vertical: 6 inches up and down (club approaches from various angles)
+        vertical_range = int(6.0 * pixels_per_inch)
+
+        # Define detection region
+        x1 = max(0, ball_x - horizontal_range)
+        x2 = min(gray.shape[1], ball_x + horizontal_range)
+        y1 = max(0, ball_y - vertical_range)
+        y2 = min(gray.shape[0], ball_y + vertical_range)
+
+        if x2 <= x1 or y2 <= y1:
+            return False
+
+        region = gray[y1:y2, x1:x2]
+
+        # Look for edges (club head has distinct edges)
+        edges = cv2.Canny(region, 50, 150)
+
+        # Count edge pixels - club head should have significant edges
+        edge_pixels = np.count_nonzero(edges)
+        edge_density = edge_pixels / (region.shape[0] * region.shape[1])
+
+        # LOWER threshold (8% instead of 15%) to catch fast-moving clubs during downswing
+        # Fast motion may blur edges, so we need to be more sensitive
+        threshold = 0.08
+        club_detected = edge_density > threshold
+
+        # Debug logging to help diagnose detection issues
+        if club_detected:
+            print(f"   Club motion detected near ball: edge_density={edge_density:.3f} (threshold={threshold})")
+            print(f"      Detection box: {horizontal_range*2}px wide x {vertical_range*2}px tall (~12\" x 12\")")
+
+        return club_detected
+
+    def _convert_bayer_to_gray(self, frame):
+        """Convert Bayer RAW (SRGGB10) to grayscale using C++ or OpenCV fallback
+
+        C++ version: ~0.1ms per frame
+        Numba fallback: single-pass 2x2 average, same output as C++
+        OpenCV fallback: pack to 8-bit + SIMD demosaic, no float temporaries
+
+        Intermediates live in reusable scratch buffers; the returned gray frame
+        is always freshly allocated, since the camera reader keeps it in the
+        pre-impact lookback buffer.
+        """
+        # Check if this is 10-bit Bayer RAW data (uint16, single channel)
+        if frame.dtype == np.uint16 and len(frame.shape) == 2:
+            # Try C++ version first (5-10x faster)
+            if FAST_DETECTION_AVAILABLE:
+                try:
+                    return fast_detection.bayer_to_gray(frame)
+                except Exception as e:
+                    print(f"C++ bayer conversion failed, using OpenCV fallback: {e}")
+                    # Fall through to OpenCV version
+
+            if NUMBA_AVAILABLE:
+                # Fused pack + 2x2 average (matches the C++ path), then back to full size
+                height, width = frame.shape
+                gray_small = self._scratch("bayer_small", (height // 2, width // 2))
+                _bayer10_to_gray8_numba(frame, gray_small)
+                return cv2.resize(gray_small, (width, height), interpolation=cv2.INTER_LINEAR)
+
+            # OpenCV fallback: pack 10-bit to 8-bit (one SIMD pass, no float temporaries),
+            # then OpenCV's demosaic straight to full-resolution gray - no downscale/resize
+            # RGGB Bayer pattern: [R  G1]
+            #                     [G2 B ]
+            bayer8 = cv2.convertScaleAbs(frame, dst=self._scratch("bayer8", frame.shape), alpha=0.25)  # 0-1023 -> 0-255
+            return cv2.cvtColor(bayer8, cv2.COLOR_BayerRG2GRAY)
+        else:
+            # Not Bayer RAW, return as-is
+            return frame
+
+    def _to_gray(self, frame):
+        """Convert frame to 2D grayscale (handles all formats: native Y, RGB, RGBA/XBGR)
+
+        Grayscale input is returned as-is, so callers can convert once per frame
+        and pass the result to every detection helper.
+        """
+        if len(frame.shape) == 3:
+            if frame.shape[2] == 1:
+                # Single channel (native Y format from OV9281) - squeeze to 2D
+                return frame[:, :, 0]
+            elif frame.shape[2] == 4:
+                # 4-channel (XBGR8888) - convert to grayscale
+                return cv2.cvtColor(frame, cv2.COLOR_BGRA2GRAY)
+            elif frame.shape[2] == 3:
+                # 3-channel RGB
+                return cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+            else:
+                raise ValueError(f"Unexpected image format. Expected 1, 3, or 4 channels, got {frame.shape[2]}")
+        elif len(frame.shape) == 2:
+            return frame  # Already grayscale (H,W)
+        else:
+            raise ValueError(f"Unexpected image format. Expected (H,W), (H,W,1), (H,W,3), or (H,W,4), got shape {frame.shape}")
+
+    def _detect_ball(self, frame):
+        """Detect golf ball in frame using color-filtered circle detection
+
+        Focuses specifically on white/bright colored balls and ignores
+        darker objects like shoes, clubs, metallic reflections, etc.
+
+        Uses fast C++ implementation if available (3-5x speedup),
+        otherwise falls back to Python version.
+        """
+        # Disable C++ detection for now - doesn't support 4-channel XBGR8888 format
+        # Will re-enable after updating C++ module to handle 4-channel images
+        # if FAST_DETECTION_AVAILABLE:
+        #     result = fast_detection.detect_ball(frame)
+        #     if result is not None:
+        #         # C++ returns tuple (x, y, radius)
+        #         return np.array([result[0], result[1], result[2]], dtype=np.uint16)
+        #     return None
+
+        # Python fallback - OPTIMIZED for OV9281 monochrome camera
+        # Works on both color and grayscale cameras
+
+        # Grayscale input (from _to_gray) is used directly - no per-call conversion
+        gray = self._to_gray(frame)
+
+        # === DOWNSCALE FOR DETECTION ===
+        # Run the detection pipeline at <=320x240 (4x fewer pixels for 640x480 frames)
+        # Brightness/contrast validation below still uses the full-res gray
+        scale = 2 if gray.shape[1] >= 640 else 1
+        if scale > 1:
+            small_shape = (gray.shape[0] // scale, gray.shape[1] // scale)
+            detect_gray = cv2.resize(gray, (small_shape[1], small_shape[0]),
+                                     dst=self._scratch("detect_gray", small_shape),
+                                     interpolation=cv2.INTER_AREA)
+        else:
+            detect_gray = gray
+
+        # === CLAHE PREPROCESSING (PiTrac-style) ===
+        # Enhance contrast for better ball detection in varying lighting
+        enhanced_gray = self._clahe.apply(detect_gray, self._scratch("enhanced", detect_gray.shape))
+
+        if NUMBA_AVAILABLE:
+            # Same bright + edge mask as the OpenCV branch below, built in compiled code
+            combined = self._scratch("combined", detect_gray.shape)
+            _build_mask_numba(enhanced_gray, combined)
+        else:
+            # === BRIGHTNESS DETECTION (ultra-sensitive for dark camera) ===
+            # User's ball has brightness of only 24, so threshold must be very low
+            bright_mask = self._scratch("bright_mask", detect_gray.shape)
+            cv2.threshold(enhanced_gray, 50, 255, cv2.THRESH_BINARY, dst=bright_mask)
+
+            # Clean up noise with morphological operations (in place)
+            cv2.morphologyEx(bright_mask, cv2.MORPH_OPEN, self._morph_kernel, dst=bright_mask)   # Remove small noise
+            cv2.morphologyEx(bright_mask, cv2.MORPH_CLOSE, self._morph_kernel, dst=bright_mask)  # Fill small gaps
+
+            # === EDGE DETECTION (sharp circular edges) ===
+            edges = cv2.Canny(enhanced_gray, 50, 150, edges=self._scratch("edges", detect_gray.shape))
+
+            # Combine bright regions + edges for robust detection
+            # Canny fires on few pixels - set just those in the bright mask
+            # (indexed write instead of streaming both full arrays through bitwise_or)
+            ys, xs = np.nonzero(edges)
+            bright_mask[ys, xs] = 255
+            combined = bright_mask
+
+        # Blur for smoother circle detection
+        # MATCHED TO optimized_detection.py
+        blurred = cv2.GaussianBlur(combined, (9, 9), 2, dst=self._scratch("blurred", detect_gray.shape))
+
+        # === ULTRA-SENSITIVE CIRCLE DETECTION ===
+        # Very low param2 values for maximum sensitivity
+        circles = self._find_circles(blurred, scale)
+
+        if circles is not None and len(circles[0]) > 0:
+            circles = np.uint16(np.around(circles * scale))  # Back to full-res coordinates
+
+            # === CONCENTRIC CIRCLE REMOVAL (PiTrac-style) ===
+            # Remove duplicate circles with same center but different radius
+            # HoughCircles returns circles strongest-first (accumulator votes), so the
+            # best-supported circle of each cluster is the one kept
+            # Centers are bucketed into a 10px grid - only the 3x3 neighbouring cells
+            # need checking, O(N) instead of comparing against every kept center
+            filtered_circles = []
+            used_centers = {}  # (x // 10, y // 10) -> [(x, y), ...]
+
+            for circle in circles[0]:
+                x, y, r = int(circle[0]), int(circle[1]), int(circle[2])
+                bx, by = x // 10, y // 10
+
+                # Check if this center is already used (within 10px tolerance)
+                is_duplicate = False
+                for nx in (bx - 1, bx, bx + 1):
+                    for ny in (by - 1, by, by + 1):
+                        for (cx, cy) in used_centers.get((nx, ny), ()):
+                            if abs(x - cx) < 10 and abs(y - cy) < 10:
+                                is_duplicate = True
+                                break
+                        if is_duplicate:
+                            break
+                    if is_duplicate:
+                        break
+
+                if not is_duplicate:
+                    filtered_circles.append(circle)
+                    used_centers.setdefault((bx, by), []).append((x, y))
+
+            # === SMART FILTERING - Reject dark false detections ===
+            # In ultra-dark scenes, HoughCircles detects noise patterns as circles
+            # Filter to find the BRIGHT ball on the mat, not dark noise circles
+            if NUMBA_AVAILABLE:
+                # Compiled filtering/scoring (same rules as the Python loop below)
+                best_idx, best_score = _score_circles_numba(gray, np.array(filtered_circles, dtype=np.int32))
+                best_circle = filtered_circles[best_idx] if best_idx >= 0 else None
+            else:
+                best_circle = None
+                best_score = 0
+
+                for circle in filtered_circles:
+                    x, y, r = int(circle[0]), int(circle[1]), int(circle[2])
+
+                    # Validate bounds
+                    if x - r < 0 or x + r >= gray.shape[1]:
+                        continue
+                    if y - r < 0 or y + r >= gray.shape[0]:
+                        continue
+
+                    # Ball size filtering - golf ball should be 20-100px radius at typical distance
+                    if r < 20 or r > 100:
+                        continue
+
+                    # Extract ball region for validation
+                    y1 = max(0, y - r)
+                    y2 = min(gray.shape[0], y + r)
+                    x1 = max(0, x - r)
+                    x2 = min(gray.shape[1], x + r)
+
+                    region = gray[y1:y2, x1:x2]
+
+                    if region.size == 0:
+                        continue
+
+                    # === BRIGHTNESS FILTERING ===
+                    # Reject circles in pitch-black areas (noise patterns)
+                    region_brightness = region.mean()
+
+                    # Ball brightness with diagnostic settings (100 FPS, 1500µs, 8x): ~60-65
+                    # Using same threshold as diagnostic
+                    if region_brightness < 50:
+                        continue
+
+                    # === CIRCULARITY CHECK ===
+                    # Ball has bright center from light reflection
+                    # Mat texture is grainy and uniform
+                    max_brightness = region.max()
+                    brightness_contrast = max_brightness - region_brightness
+
+                    # Diagnostic showed ball contrast ~190-200
+                    # Keep lenient threshold
+                    if brightness_contrast < 30:
+                        continue
+
+                    # === SMART SCORING ===
+                    # Prioritize: peak brightness > circularity > position > size
+                    score = 0
+
+                    # Peak brightness score (ball has bright center from light reflection)
+                    score += max_brightness * 1.5
+
+                    # Brightness contrast score (smooth ball vs grainy mat)
+                    score += brightness_contrast * 2.0
+
+                    # Mean brightness score
+                    score += region_brightness * 1.0
+
+                    # Position score (ball is usually in bottom 2/3 of frame on hitting mat)
+                    # Higher Y = bottom of frame = higher score
+                    position_score = (y / gray.shape[0]) * 30
+                    score += position_score
+
+                    # Size score (ideal ball radius is 30-60px)
+                    if 30 <= r <= 60:
+                        score += 30
+
+                    if score > best_score:
+                        best_score = score
+                        best_circle = circle
+
+            # Return best circle immediately (skip refinement for ultra-fast detection)
+            if best_circle is not None:
+                return best_circle
+
+        return None
+
+    def _detect_ball_roi(self, frame, last_ball, pad=2.0):
+        """Detect the ball in a small window around its last known position
+
+        Works on frame[y-pr:y+pr, x-pr:x+pr] with pr = r * pad (a ~3r x 3r+ window
+        instead of the whole frame). A bright-blob check of the known ball size runs
+        first; the full HoughCircles pipeline only runs if it finds nothing.
+        The result is mapped back to full-frame coordinates. Returns None if not found.
+        """
+        x, y, r = int(last_ball[0]), int(last_ball[1]), int(last_ball[2])
+        pr = max(int(r * pad), r + 20)  # Leave room for the bounds check in _detect_ball
+
+        x1, y1 = max(0, x - pr), max(0, y - pr)
+        roi = frame[y1:y + pr, x1:x + pr]
+        if roi.shape[0] == 0 or roi.shape[1] == 0:
+            return None
+
+        ball = self._detect_blob(roi, x - x1, y - y1, r)
+        if ball is None:
+            ball = self._detect_ball(roi)
+        if ball is None:
+            return None
+
+        return np.array([int(ball[0]) + x1, int(ball[1]) + y1, int(ball[2])], dtype=np.uint16)
+
+    def _detect_blob(self, roi, x, y, r):
+        """Find the locked ball as a bright round blob of radius r (+/-20%) in roi
+
+        O(pixels) threshold + blob pass instead of HoughCircles' O(pixels x radii).
+        (x, y) is the last ball center in roi coordinates; the closest matching
+        blob wins. Returns (x, y, r) in roi coordinates, or None.
+        """
+        bright_mask = self._scratch("blob_mask", roi.shape)
+        cv2.threshold(roi, 50, 255, cv2.THRESH_BINARY, dst=bright_mask)
+
+        best = None
+        best_dist = None
+        for keypoint in self._blob.detect(bright_mask):
+            kr = keypoint.size / 2
+            if abs(kr - r) > r * 0.2:
+                continue
+
+            kx, ky = keypoint.pt
+            dist = (kx - x) ** 2 + (ky - y) ** 2
+            if best_dist is None or dist < best_dist:
+                best = (int(round(kx)), int(round(ky)), int(round(kr)))
+                best_dist = dist
+
+        return best
+
+    def _hough_circles(self, blurred, param2, scale=1):
+        """Single HoughCircles pass with the tuned detection parameters
+
+        Distances/radii are in full-res pixels and divided by scale for a
+        downscaled detection image.
+        """
+        return cv2.HoughCircles(
+            blurred,
+            cv2.HOUGH_GRADIENT,
+            dp=1,
+            minDist=50 // scale,        # Reduced from 80 for easier detection
+            param1=20,                  # Reduced from 30 for easier detection
+            param2=param2,              # ULTRA-SENSITIVE values
+            minRadius=10 // scale,      # Reduced from 15 to catch smaller balls
+            maxRadius=250 // scale      # Increased to catch larger detections
+        )
+
+    def _find_circles(self, blurred, scale=1, max_circles=5):
+        """Find circle candidates with as few HoughCircles passes as possible
+
+        Tries the last successful param2 first (one pass while the ball is steady),
+        otherwise bisects param2 in [5, 20] for a result with 1..max_circles circles
+        (~4 passes worst case vs. up to 7 for a fixed sweep). Lower param2 = more circles.
+        """
+        if self._last_param2 is not None:
+            circles = self._hough_circles(blurred, self._last_param2, scale)
+            if circles is not None and len(circles[0]) <= max_circles:
+                return circles
+            self._last_param2 = None
+
+        lo, hi = 5, 20
+        too_many = None  # Best fallback: a result with more than max_circles circles
+        while lo <= hi:
+            param2 = (lo + hi) // 2
+            circles = self._hough_circles(blurred, param2, scale)
+            count = 0 if circles is None else len(circles[0])
+
+            if count == 0:
+                hi = param2 - 1  # Too strict - lower threshold
+            elif count > max_circles:
+                too_many = circles
+                lo = param2 + 1  # Too sensitive - raise threshold
+            else:
+                self._last_param2 = param2
+                return circles
+
+        # Accept any circles found (scoring below picks the ball)
+        return too_many
+
+    def _detect_ball_with_motion(self, gray, prev_gray=None, last_ball=None):
+        """
+        EDGE VELOCITY TRACKING - Motion-based ball detection
+
+        Uses ROI frame-difference + sparse optical flow to track movement patterns and distinguish:
+        - Ball: Small, bright, stationary (then sudden motion on impact)
+        - Club: Large, elongated, continuous motion during swing
+        - Mat/Hands: Large, low contrast, irregular motion
+
+        gray/prev_gray are the current and previous frames already converted
+        with _to_gray (once per frame in _capture_loop).
+        If last_ball is given, only a window around it is searched (_detect_ball_roi).
+
+        Returns: (ball_position, velocity, motion_state)
+        - ball_position: (x, y, r) or None
+        - velocity: pixels per frame
+        - motion_state: "STATIONARY", "MOVING", or "IMPACT"
+        """
+
+        # First pass: Detect potential balls using traditional method
+        if last_ball is not None:
+            ball = self._detect_ball_roi(gray, last_ball)
+        else:
+            ball = self._detect_ball(gray)
+
+        if ball is None or prev_gray is None:
+            return (ball, 0, "UNKNOWN")
+
+        # === ROI MOTION - Only the ball region is analysed (no dense full-frame flow) ===
+        try:
+            x, y, r = int(ball[0]), int(ball[1]), int(ball[2])
+            height, width = gray.shape[:2]
+
+            # Ball region (expand slightly for better coverage)
+            y1 = max(0, y - r - 10)
+            y2 = min(height, y + r + 10)
+            x1 = max(0, x - r - 10)
+            x2 = min(width, x + r + 10)
+
+            roi = gray[y1:y2, x1:x2]
+            if roi.size == 0:
+                return (ball, 0, "UNKNOWN")
+
+            # Cheap gate: frame difference inside the ROI - skip flow when nothing changed
+            if cv2.absdiff(roi, prev_gray[y1:y2, x1:x2]).mean() < 2.0:
+                ball_velocity = 0.0
+            else:
+                # Sparse Lucas-Kanade flow on the ball center, within a padded window only
+                pad = r + 40
+                wy1, wy2 = max(0, y - pad), min(height, y + pad)
+                wx1, wx2 = max(0, x - pad), min(width, x + pad)
+                center = np.array([[[x - wx1, y - wy1]]], dtype=np.float32)
+
+                new_center, status, _ = cv2.calcOpticalFlowPyrLK(
+                    prev_gray[wy1:wy2, wx1:wx2], gray[wy1:wy2, wx1:wx2], center, None,
+                    winSize=(21, 21),  # Search window
+                    maxLevel=2         # Pyramid levels
+                )
+                if status is None or status[0][0] == 0:
+                    return (ball, 0, "UNKNOWN")
+
+                dx, dy = new_center[0][0] - center[0][0]
+                ball_velocity = math.hypot(float(dx), float(dy))
+
+            # === MOTION STATE CLASSIFICATION ===
+            # Stationary: Very low velocity (<2 px/frame)
+            # Moving: Moderate velocity (2-20 px/frame)
+            # Impact: High velocity (>20 px/frame)
+
+            if ball_velocity < 2.0:
+                motion_state = "STATIONARY"
+            elif ball_velocity < 20.0:
+                motion_state = "MOVING"
+            else:
+                motion_state = "IMPACT"
+
+            return (ball, ball_velocity, motion_state)
+
+        except Exception as e:
+            # Optical flow failed - fall back to ball detection only
+            return (ball, 0, "UNKNOWN")
+
+    def _ball_has_moved(self, prev_ball, curr_ball, threshold=40):
+        """Check if ball has moved significantly"""
+        if prev_ball is None or curr_ball is None:
+            return False
+
+        dx = int(curr_ball[0]) - int(prev_ball[0])
+        dy = int(curr_ball[1]) - int(prev_ball[1])
+
+        # Squared distance - no sqrt needed for a threshold check
+        return dx * dx + dy * dy > threshold * threshold
+
+    def _ball_displacement(self, prev_ball, curr_ball):
+        """Calculate displacement distance between two ball positions in pixels"""
+        return math.sqrt(self._ball_displacement_sq(prev_ball, curr_ball))
+
+    def _ball_displacement_sq(self, prev_ball, curr_ball):
+        """Squared displacement in pixels - compare against threshold**2, no sqrt"""
+        if prev_ball is None or curr_ball is None:
+            return 0
+
+        dx = int(curr_ball[0]) - int(prev_ball[0])
+        dy = int(curr_ball[1]) - int(prev_ball[1])
+
+        return dx * dx + dy * dy
+
+    def _is_same_ball(self, ball1, ball2, radius_tolerance=0.6):
+        """Check if two detections are the same ball based on position and radius
+
+        Uses relaxed radius tolerance (60%) because HoughCircles can vary
+        the detected radius significantly due to ball dimples and lighting.
+        """
+        if ball1 is None or ball2 is None:
+            return False
+
+        # Check position - balls should be in roughly same location
+        x1, y1 = int(ball1[0]), int(ball1[1])
+        x2, y2 = int(ball2[0]), int(ball2[1])
+        dx = x2 - x1
+        dy = y2 - y1
+
+        # If ball moved more than 100 pixels, it's probably not the same ball
+        if dx * dx + dy * dy > 100 * 100:
+            return False
+
+        # Check radius with relaxed tolerance
+        r1 = int(ball1[2])
+        r2 = int(ball2[2])
+
+        # Radius should be within 50% of original (relaxed for dimpled balls)
+        # Multiply instead of divide (also safe for a zero radius)
+        return abs(r1 - r2) < radius_tolerance * max(r1, r2)
+
+    def _ball_exited_hitbox(self, locked_ball, current_ball, hitbox_inches=6.0):
+        """Check if ball exited the hit box zone (6x6 inch safe area)"""
+        if locked_ball is None or current_ball is None:
+            return False
+
+        # Calculate pixels per inch from ball radius
+        # Golf ball radius = 0.84 inches (diameter 1.68")
+        ball_radius_px = int(locked_ball[2])
+        pixels_per_inch = ball_radius_px / 0.84
+
+        # Hit box is 6x6 inches = 3 inches in each direction from center
+        hitbox_radius_px = (hitbox_inches / 2.0) * pixels_per_inch
+
+        # Check if ball moved outside hit box
+        dx = int(current_ball[0]) - int(locked_ball[0])
+        dy = int(current_ball[1]) - int(locked_ball[1])
+
+        return dx * dx + dy * dy > hitbox_radius_px * hitbox_radius_px
+
+    def _create_replay_video(self, frames, output_path, fps=60, speed_multiplier=0.5):
+        """Create slow-motion MP4 video from captured frames (like Rapsodo)
+
+        Args:
+            frames: List of frames to convert to video
+            output_path: Path to save the MP4 video
+            fps: Original capture frame rate
+            speed_multiplier: Playback speed (0.5 = half speed, 1.0 = normal, 2.0 = double speed)
+        """
+        if not CAMERA_AVAILABLE:
+            print("OpenCV not available - cannot create video")
+            return None
+
+        try:
+            print(f"Creating replay video with {len(frames)} frames at {speed_multiplier}x speed...")
+
+            if len(frames) == 0:
+                print("No frames to create video")
+                return None
+
+            # Calculate playback FPS (slow-motion effect)
+            # Original: 200 FPS, Speed 0.5x → Playback at 100 FPS for half-speed
+            playback_fps = fps * speed_multiplier
+
+            # Get frame dimensions from first frame
+            first_frame = frames[0]
+            height, width = first_frame.shape[:2]
+
+            print(f"   Video: {width}x{height} at {playback_fps:.1f} FPS")
+            print(f"   Total frames: {len(frames)} ({len(frames)/playback_fps:.2f}s duration)")
+
+            # Create video writer with H.264 codec (MP4)
+            # fourcc: 'mp4v' = MPEG-4, 'avc1' = H.264, 'X264' = x264
+            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+            video_writer = cv2.VideoWriter(output_path, fourcc, playback_fps, (width, height), isColor=True)
+
+            if not video_writer.isOpened():
+                print("Failed to open video writer")
+                return None
+
+            # Write all frames to video
+            for i, frame in enumerate(frames):
+                # Convert frame to BGR for video (OpenCV format)
+                if len(frame.shape) == 2:
+                    # Grayscale (H, W) - convert to BGR
+                    bgr_frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+                elif len(frame.shape) == 3:
+                    if frame.shape[2] == 1:
+                        # Grayscale (H, W, 1) - squeeze and convert to BGR
+                        bgr_frame = cv2.cvtColor(frame[:, :, 0], cv2.COLOR_GRAY2BGR)
+                    elif frame.shape[2] == 3:
+                        # Assume RGB - convert to BGR
+                        bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+                    elif frame.shape[2] == 4:
+                        # RGBA - convert to BGR
+                        bgr_frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2BGR)
+                else:
+                    print(f"Unsupported frame shape: {frame.shape}")
+                    continue
+
+                video_writer.write(bgr_frame)
+
+            # Release video writer
+            video_writer.release()
+
+            print(f"Replay video saved: {output_path}")
+            return output_path
+
+        except Exception as e:
+            print(f"Failed to create video: {e}")
+            return None
+
+    def _camera_reader(self, frame_queue, frame_buffer, stop_event):
+        """Producer thread: grab every sensor frame and hand it to the detection loop
+
+        Only captures - never waits on detection. Each frame goes into frame_buffer
+        (pre-impact lookback) and frame_queue; when the queue is full the oldest
+        frame is dropped, so a slow detection pass skips frames instead of
+        stalling the camera.
+        """
+        while not stop_event.is_set():
+            try:
+                # Bayer RAW (SRGGB10) is already converted to grayscale by _capture_frame
+                frame = self._capture_frame(copy=True)
+            except Exception as e:
+                if not stop_event.is_set() and self.is_running:
+                    print(f"Camera reader error: {e}")
+                break
+
+            # The same array is shared uncopied by frame_buffer, frame_queue, detection
+            # and the replay - make it read-only so any in-place writer fails loudly
+            frame.flags.writeable = False
+
+            frame_buffer.append(frame)
+            try:
+                frame_queue.put_nowait(frame)
+            except queue.Full:
+                try:
+                    frame_queue.get_nowait()  # Drop the oldest frame
+                except queue.Empty:
+                    pass
+                frame_queue.put_nowait(frame)
+
+    def _handle_impact(self, frame_buffer, frame_queue, shot_number, captures_folder, frame_rate, post_frames=20):
+        """Collect the post-impact frames, announce the shot and queue its replay files
+
+        Frames go into one preallocated (N, H, W) array: the pre-impact frames from
+        frame_buffer followed by the next post_frames frames from the camera reader.
+        """
+        # Capture frames: 40 BEFORE impact (from buffer) + 20 AFTER impact
+        # Drain first, then snapshot - everything drained was appended to frame_buffer
+        # before it was queued, so it is in the snapshot. The camera reader keeps
+        # running on its own thread, so a frame may land in both the snapshot and the
+        # queue after the drain; those are skipped below by identity.
+        while True:
+            try:
+                frame_queue.get_nowait()
+            except queue.Empty:
+                break
+        pre = list(frame_buffer)
+        pre_frames = len(pre)
+        pre_ids = {id(buffered) for buffered in pre}
+        latest = pre[-1]
+        frames = np.empty((pre_frames + post_frames,) + latest.shape, dtype=latest.dtype)
+        for i, buffered in enumerate(pre):
+            frames[i] = buffered
+        print(f"   📸 Captured {pre_frames} pre-impact frames from buffer")
+
+        # Post-impact frames (20 frames = 100ms at 200 FPS) arrive at sensor pace from the reader
+        captured_post = 0
+        while captured_post < post_frames:
+            try:
+                frame = frame_queue.get(timeout=1.0)
+            except queue.Empty:
+                # Camera stalled - keep the shot with the frames we have
+                print(f"   Camera stalled after {captured_post} post-impact frames - saving what was captured")
+                frames = frames[:pre_frames + captured_post]
+                break
+            if id(frame) in pre_ids:
+                continue  # Already copied from the snapshot
+            frames[pre_frames + captured_post] = frame
+            captured_post += 1
+        del pre, pre_ids  # Held until here so the ids above cannot be reused by new frames
+
+        print(f"   📸 Total: {len(frames)} frames captured ({pre_frames} before + {captured_post} after impact)")
+
+        print(f"Shot #{shot_number} saved!")
+        self.shotCaptured.emit(shot_number)
+
+        # Create replay files off the capture path (replayReady fires when the GIF is done)
+        self._replay_queue.put((frames, captures_folder, shot_number, frame_rate))
+
+    def _replay_worker(self):
+        """Write queued replay files so the capture loop can return to acquisition immediately"""
+        while True:
+            item = self._replay_queue.get()
+            if item is None:
+                break
+
+            frames, captures_folder, shot_number, frame_rate = item
+            try:
+                # Create replay files (40 before + 20 after at 0.025x speed = 5 FPS playback)
+                # Each frame visible for 200ms - LONGER pre-impact window to capture swing
+
+                # Create MP4 video for storage/transfer
+                video_filename = f"shot_{shot_number:03d}_replay.mp4"
+                video_path = f"{captures_folder}/{video_filename}"
+                video_result = self._create_replay_video(frames, video_path, fps=frame_rate, speed_multiplier=0.025)
+
+                if video_result:
+                    print(f"Replay video saved: {video_filename}")
+
+                # Create GIF for popup playback (loops automatically)
+                gif_filename = f"shot_{shot_number:03d}_replay.gif"
+                gif_path = f"{captures_folder}/{gif_filename}"
+                if GIF_AVAILABLE:
+                    # Popup GIF at half resolution - 4x less data pickled to the worker and LZW-encoded.
+                    # One contiguous array pickles in one piece; the MP4 above keeps full resolution.
+                    gif_size = (frames.shape[2] // 2, frames.shape[1] // 2)
+                    gif_frames = np.empty((len(frames), gif_size[1], gif_size[0]) + frames.shape[3:],
+                                          dtype=frames.dtype)
+                    for i, frame in enumerate(frames):
+                        gif_frames[i] = cv2.resize(frame, gif_size,
+                                                   interpolation=cv2.INTER_AREA).reshape(gif_frames.shape[1:])
+                    gif_future = self._gif_pool.submit(encode_replay_gif, gif_frames, gif_path,
+                                                       fps=frame_rate, speed_multiplier=0.025)
+                    gif_future.add_done_callback(self._on_replay_gif_done)
+                else:
+                    print("PIL not available - cannot create GIF for popup")
+            except Exception as e:
+                print(f"Failed to write replay for shot #{shot_number}: {e}")
+
+    def _on_replay_gif_done(self, future):
+        """Emit replayReady once the worker process has written the GIF"""
+        try:
+            gif_result = future.result()
+        except Exception as e:
+            print(f"Failed to create GIF: {e}")
+            return
+
+        if gif_result:
+            # Already absolute (captures_folder is absolute) - ready for QML as-is
+            print(f"Popup GIF created: {gif_result}")
+            self.replayReady.emit(gif_result)  # Signal QML to show popup with GIF
+
+    def _set_status(self, message, color):
+        """Emit statusChanged only when the status actually changes
+
+        The capture loop reports status every frame; re-emitting an identical
+        status would queue a cross-thread Qt event per frame for nothing.
+        """
+        status = (message, color)
+        if status != self._last_status:
+            self._last_status = status
+            self.statusChanged.emit(message, color)
+
+    def _capture_loop(self):
+        """Main capture loop running in background thread"""
+        reader_stop = threading.Event()
+        reader_thread = None
+        try:
+            # Create captures folder
+            # Absolute once per session - replay paths are built from it without join/abspath per shot
+            captures_folder = os.path.abspath("ball_captures")
+            os.makedirs(captures_folder, exist_ok=True)
+
+            # Find next shot number
+            existing_shots = [f for f in os.listdir(captures_folder) if f.startswith("shot_")]
+            if existing_shots:
+                shot_numbers = [int(f.split("_")[1]) for f in existing_shots]
+                next_shot = max(shot_numbers) + 1
+            else:
+                next_shot = 0
+
+            # Load camera settings
+            # Capture mode: Direct sensor access (no ISP display conversion)
+            # Camera sensor can do 100 FPS - ISP limit only affects preview/recording
+            # ULTRA-HIGH-SPEED MODE: 200 FPS for impact capture (300 FPS causes timeouts)
+            shutter_speed = 800    # 0.8ms ultra-fast shutter for crisp motion freeze
+            gain = 10.0            # Max gain to compensate for fast shutter
+            frame_rate = 200       # 200 FPS for super high-speed capture (5ms between frames)
+
+            # DIRECTIONAL IMPACT DETECTION SETTINGS
+            # Configure which axis/direction the ball moves when hit
+            impact_axis = 1        # 0=X axis (camera on side), 1=Y axis (camera behind/front)
+            impact_direction = -1  # 1=positive (down/right), -1=negative (up/left) - BALL MOVES UP!
+            impact_threshold = 10  # Pixels ball must move down range to trigger (ultra-sensitive)
+
+            print(f"Using ultra-high-speed capture: Shutter={shutter_speed}µs, Gain={gain}x, FPS={frame_rate}", flush=True)
+            print(f"🎯 Impact detection: Axis={'Y' if impact_axis==1 else 'X'}, Direction={'positive' if impact_direction==1 else 'negative'}, Threshold={impact_threshold}px", flush=True)
+
+            # Force cleanup of any lingering camera instances
+            try:
+                # Close any existing global camera instances
+                print("🧹 Cleaning up any existing camera instances...", flush=True)
+                time.sleep(0.5)
+            except Exception as e:
+                print(f"   Camera cleanup check: {e}")
+
+            # Initialize camera with retry logic (camera hardware may need time to release)
+            camera_initialized = False
+            for attempt in range(3):
+                try:
+                    if attempt > 0:
+                        print(f"   Retry attempt {attempt + 1}/3...")
+                        time.sleep(3)  # Wait longer between retries (was 2, now 3)
+
+                    self.picam2 = Picamera2()
+
+                    # Get resolution and format from settings
+                    resolution_str = "320x240"  # Default to high-FPS mode
+                    camera_format = "RAW"  # Default to RAW for high FPS
+
+                    if self.settings_manager:
+                        resolution_str = self.settings_manager.getString("cameraResolution") or "320x240"
+                        camera_format = self.settings_manager.getString("cameraFormat") or "RAW"
+
+                    # Parse resolution string
+                    try:
+                        width, height = map(int, resolution_str.split('x'))
+                        resolution = (width, height)
+                    except:
+                        print(f"Invalid resolution '{resolution_str}', using 320x240")
+                        resolution = (320, 240)
+
+                    # Store resolution for YUV420 conversion in _capture_frame()
+                    self.capture_resolution = resolution
+
+                    # Configure camera based on format
+                    # NOTE: OV9281 is MONOCHROME - outputs native Y (grayscale), NOT Bayer RGB!
+                    if camera_format == "RAW":
+                        # RAW format for high FPS (bypasses ISP completely!)
+                        # Use lores stream which gets direct sensor output - NO ISP PROCESSING
+                        config = self.picam2.create_video_configuration(
+                            main={"size": (640, 480), "format": "YUV420"},  # Dummy main (required)
+                            lores={"size": resolution},  # THIS bypasses ISP - direct sensor data!
+                            buffer_count=CAPTURE_BUFFER_COUNT,  # Small buffer for low latency
+                            controls={
+                                "FrameRate": frame_rate,
+                                "ExposureTime": shutter_speed,
+                                "AnalogueGain": gain
+                            }
+                        )
+                        self.use_lores_stream = True  # Flag to use lores stream
+                    else:
+                        # YUV420 format (ISP processed, limited to ~30 FPS at 640x480)
+                        # Y plane is used directly as the grayscale detection frame - no cvtColor
+                        config = self.picam2.create_video_configuration(
+                            main={"size": resolution, "format": "YUV420"},
+                            buffer_count=CAPTURE_BUFFER_COUNT,  # Small buffer for low latency
+                            controls={
+                                "FrameRate": frame_rate,
+                                "ExposureTime": shutter_speed,
+                                "AnalogueGain": gain
+                            }
+                        )
+                        self.use_lores_stream = False
+
+                    print(f"   Capture config: {resolution} {camera_format} @ {frame_rate} FPS")
+                    self.picam2.configure(config)
+                    self.picam2.start()
+
+                    # Short warmup - manual exposure/gain need no AE convergence
+                    print("   Warming up camera...", flush=True)
+                    time.sleep(0.3)
+                    # Capture and discard first 10 frames (often dark/unstable)
+                    # capture blocks until the next sensor frame - no sleep needed
+                    for i in range(10):
+                        _ = self._capture_frame()
+                    print("   Camera warmed up", flush=True)
+                    camera_initialized = True
+                    print("Camera initialized successfully", flush=True)
+                    break
+                except Exception as e:
+                    print(f"Camera init attempt {attempt + 1} failed: {e}")
+                    if self.picam2 is not None:
+                        try:
+                            self.picam2.close()
+                        except:
+                            pass
+                        self.picam2 = None
+
+            if not camera_initialized:
+                raise Exception("Failed to initialize camera after 3 attempts. Please wait a moment and try again.")
+
+            self.statusChanged.emit("Detecting ball...", "yellow")
+
+            # === IMMEDIATE DEBUG - Save first frame to see what camera is capturing ===
+            print("🔍 Capturing first frame for diagnosis...", flush=True)
+            first_frame = self._capture_frame()  # Bayer RAW (SRGGB10) comes back as grayscale
+
+            # Save first frame for diagnosis
+            self._save_frame("capture_first_frame.jpg", first_frame)
+
+            print(f"   Frame shape: {first_frame.shape}", flush=True)
+            print(f"   Frame dtype: {first_frame.dtype}", flush=True)
+            print(f"   Frame min/max: {first_frame.min()}/{first_frame.max()}", flush=True)
+
+            # Test detection on first frame
+            first_gray = self._to_gray(first_frame)
+            test_ball = self._detect_ball(first_gray)
+            if test_ball is not None:
+                print(f"   Ball detected on first frame: ({test_ball[0]}, {test_ball[1]}) r={test_ball[2]}", flush=True)
+                self.statusChanged.emit("Ball found - Locking on...", "yellow")
+            else:
+                print(f"   No ball detected on first frame", flush=True)
+                self.statusChanged.emit("No Ball Detected", "red")
+                # Save debug images (handle all formats)
+                gray = first_gray
+                cv2.imwrite("capture_gray.jpg", gray)
+                enhanced = self._clahe.apply(gray)
+                cv2.imwrite("capture_clahe.jpg", enhanced)
+                print(f"   Gray stats: min={gray.min()}, max={gray.max()}, mean={gray.mean():.1f}", flush=True)
+                print(f"   Debug images saved: capture_first_frame.jpg, capture_gray.jpg, capture_clahe.jpg", flush=True)
+
+            original_ball = None
+            stable_frames = 0
+            last_seen_ball = None
+            frames_since_seen = 0
+            consecutive_frames_seen = 0  # Track consecutive frames ball is visible (for debouncing)
+            prev_ball = None
+            frames_since_lock = 0  # Track how long ball has been locked
+            roi_misses = 0  # Consecutive ROI detection misses while locked
+            tracked_frames = 0  # Template-tracked frames since the last HoughCircles pass
+            # Last 10 frames as a bitmask (bit 0 = newest): 1=detected, 0=not detected
+            # Count hits in a window with bin((detection_history >> k) & mask).count("1")
+            detection_history = 0
+            radius_history = RollingMedian(5)  # Track last 5 radius values for smoothing
+            frame_buffer = deque(maxlen=40)  # Circular buffer for 40 pre-impact frames (200ms at 200 FPS)
+
+            # Initialize hybrid ball tracker (template matching + Kalman filter)
+            ball_tracker = BallTracker()
+            use_tracker = False  # Flag to switch between HoughCircles and tracker
+
+            # Calculate target frame time for adaptive sleep
+            target_frame_time = 1.0 / frame_rate
+            print(f"🎯 Target frame time: {target_frame_time*1000:.1f}ms ({frame_rate} FPS)")
+
+            # FPS tracking for visualization
+            fps_counter = 0
+            fps_start_time = time.perf_counter()
+            current_fps = 0
+
+            # Debug frame saving (saves periodically for diagnostics)
+            debug_frame_counter = 0
+            print("📺 C++ Motion Detection - Ultra-fast impact detection!", flush=True)
+
+            # Edge velocity tracking state
+            prev_gray_for_motion = None
+
+            self._last_status = None  # Force the first in-loop status through
+
+            # Drain frames queued during setup/diagnostics so the loop starts on a fresh frame
+            for _ in range(CAPTURE_BUFFER_COUNT):
+                self._capture_frame()
+
+            # Loop invariants bound as locals (LOAD_FAST in the hot loop)
+            perf_counter = time.perf_counter
+            is_same_ball = self._is_same_ball
+            set_status = self._set_status
+            sharpen_kernel = np.array([[-1,-1,-1],
+                                       [-1, 9,-1],
+                                       [-1,-1,-1]])
+
+            # Camera reader thread feeds the loop through a 2-deep queue (drop-oldest)
+            # and fills the pre-impact frame_buffer with every captured frame
+            frame_queue = queue.Queue(maxsize=2)
+            reader_stop.clear()
+            reader_thread = threading.Thread(target=self._camera_reader,
+                                             args=(frame_queue, frame_buffer, reader_stop), daemon=True)
+            reader_thread.start()
+
+            while self.is_running:
+                try:
+                    frame = frame_queue.get(timeout=1.0)
+                except queue.Empty:
+                    if not reader_thread.is_alive():
+                        raise RuntimeError("Camera reader stopped")
+                    continue
+
+                # Apply sharpening for better ball edge detection
+                frame = cv2.filter2D(frame, -1, sharpen_kernel)
+
+                # Grayscale once per frame - shared by tracker, detection and motion estimation
+                gray_frame = self._to_gray(frame)
+
+                # Update FPS counter
+                fps_counter += 1
+                now = perf_counter()
+                if now - fps_start_time >= 1.0:
+                    current_fps = fps_counter
+                    fps_counter = 0
+                    fps_start_time = now
+
+                # === HYBRID BALL DETECTION ===
+                # Use template matching tracker if ball is locked, otherwise use HoughCircles
+                # While tracking, HoughCircles still re-validates the ball every
+                # TRACKER_REVALIDATE_FRAMES frames or right after a weak (<0.7) match
+                revalidate = use_tracker and (tracked_frames >= TRACKER_REVALIDATE_FRAMES
+                                              or (tracked_frames > 0 and ball_tracker.tracking_confidence < 0.7))
+                if use_tracker and ball_tracker.is_locked and not revalidate:
+                    tracked_frames += 1
+
+                    # Track ball using template matching + Kalman filter
+                    track_result = ball_tracker.track(gray_frame)
+
+                    if track_result is not None:
+                        tx, ty, tr, confidence = track_result
+                        current_ball = np.array([tx, ty, tr], dtype=np.float32)
+                        #if frames_since_lock % 30 == 0:  # Print every 30 frames
+                        #    print(f"   Tracking confidence: {confidence:.2f}")
+                    else:
+                        # Tracking lost - fall back to HoughCircles
+                        print("Tracking lost - falling back to HoughCircles")
+                        use_tracker = False
+                        ball_tracker.reset()
+                        ball_result, velocity, motion_state = self._detect_ball_with_motion(gray_frame, prev_gray_for_motion)
+                        current_ball = ball_result
+                else:
+                    tracked_frames = 0
+
+                    # Use HoughCircles detection (initial detection, re-validation or after tracking lost)
+                    # Locked ball waiting for the swing: search only a window around it,
+                    # full-frame detection after 5 consecutive ROI misses
+                    roi_ball = None
+                    if original_ball is not None and frames_since_lock > 0 and last_seen_ball is not None and roi_misses < 5:
+                        roi_ball = last_seen_ball
+
+                    ball_result, velocity, motion_state = self._detect_ball_with_motion(gray_frame, prev_gray_for_motion, roi_ball)
+                    current_ball = ball_result
+
+                    if roi_ball is not None:
+                        roi_misses = 0 if current_ball is not None else roi_misses + 1
+                    elif current_ball is not None:
+                        roi_misses = 0
+
+                # Store frame for next iteration
+                prev_gray_for_motion = gray_frame
+
+                if current_ball is not None:
+                    x, y, r = int(current_ball[0]), int(current_ball[1]), int(current_ball[2])
+
+                    # Evaluated once per frame against the locked ball
+                    same_as_orig = original_ball is not None and is_same_ball(original_ball, current_ball)
+
+                    # Track radius for smoothing (helps with HoughCircles instability)
+                    radius_history.append(r)  # Window auto-truncates at 5
+
+                    # Use median radius for more stable validation
+                    median_radius = int(radius_history.median()) if len(radius_history) >= 3 else r
+                    # Plain tuple - helpers only index [0], [1], [2] (no per-frame ndarray allocation)
+                    smoothed_ball = (x, y, median_radius)
+
+                    # Validate this is the same ball (not a person/other object)
+                    if last_seen_ball is not None and not is_same_ball(last_seen_ball, smoothed_ball):
+                        # Skip this detection, likely a different object
+                        # (verbose logging removed to reduce console spam)
+                        detection_history = (detection_history << 1) & 0x3FF  # Track as not detected
+                        radius_history.clear()  # Reset radius smoothing
+                        continue
+
+                    # Ball is now visible
+                    consecutive_frames_seen += 1
+
+                    # DEBOUNCING: Only reset frames_since_seen if ball visible for 2+ consecutive frames
+                    # This prevents brief 1-frame reappearances from canceling shot detection
+                    if consecutive_frames_seen >= 2:
+                        # Ball has been visible for 2+ frames - truly reappeared, cancel shot detection
+                        if frames_since_seen > 0 and frames_since_seen < 3:
+                            # Ball reappeared before shot could be detected (club positioning, not a shot)
+                            pass  # Don't spam console
+                        frames_since_seen = 0
+                    # else: ball visible for only 1 frame - might be flicker, keep counting frames_since_seen
+
+                    last_seen_ball = smoothed_ball  # Use smoothed radius for tracking
+
+                    # Track detection in history
+                    detection_history = ((detection_history << 1) | 1) & 0x3FF
+
+                    # Check if ball has been stable
+                    if original_ball is None:
+                        # Check radius consistency with previous frame
+                        if prev_ball is not None:
+                            if not is_same_ball(prev_ball, smoothed_ball):
+                                # Radius changed too much, probably different object
+                                if DEBUG:
+                                    print(f"Radius changed: {prev_ball[2]}px → {smoothed_ball[2]}px - resetting ({stable_frames} frames)")
+                                stable_frames = 0
+                                prev_ball = None
+                                radius_history.clear()  # Reset radius smoothing
+                                continue
+                            else:
+                                # Radius is consistent - that's all we need for locking
+                                stable_frames += 1
+                                if DEBUG and stable_frames <= 3:  # Only print first few frames
+                                    print(f"✓ Stable frame {stable_frames}/3 - Ball at ({x}, {y}) r={r}px")
+                        else:
+                            stable_frames += 1
+                            if DEBUG:
+                                print(f"✓ First stable frame - Ball at ({x}, {y}) r={r}px")
+
+                        prev_ball = smoothed_ball  # Use smoothed radius for consistency
+
+                        if stable_frames >= 2:  # Only 2 stable frames needed for ULTRA-FAST locking (30% faster)
+                            original_ball = smoothed_ball
+
+                            # === ACTIVATE HYBRID BALL TRACKER FOR ROCK-SOLID TRACKING ===
+                            # Lock ball with template matching + Kalman filter
+                            ball_tracker.lock_ball(gray_frame, x, y, r)
+                            use_tracker = True
+
+                            set_status("Ball Locked - Waiting for shot...", "green")
+                            print(f"🎯 Ball locked at ({x}, {y}) with radius {r}px")
+                            print(f"   🔒 Hybrid tracker activated - template matching + Kalman filter")
+                            print(f"   Waiting for shot...")
+                            stable_frames = 0
+                            prev_ball = None
+                            frames_since_lock = 0
+
+                    # Ball is locked - check for IMPACT!
+                    elif same_as_orig:
+                        # Ball is still visible and locked - check for impact
+
+                        # Calculate ball movement (used by both modes)
+                        if impact_axis == 0:
+                            directional_movement = (x - original_ball[0]) * impact_direction
+                        else:
+                            directional_movement = (y - original_ball[1]) * impact_direction
+
+                        # Check if camera detected ball motion
+                        if FAST_DETECTION_AVAILABLE:
+                            camera_detected_motion = fast_detection.detect_impact(
+                                int(original_ball[0]), int(original_ball[1]),  # Previous position
+                                int(x), int(y),  # Current position
+                                impact_threshold,  # Distance threshold
+                                impact_axis,       # Which axis is down range (0=X, 1=Y)
+                                impact_direction   # Which direction is down range (1=pos, -1=neg)
+                            )
+                        else:
+                            # Fallback Python directional motion detection
+                            camera_detected_motion = directional_movement > impact_threshold
+
+                        # === HYBRID MODE: K-LD2 RADAR + CAMERA CONFIRMATION ===
+                        if self.use_kld2_trigger:
+                            # BEST approach: Radar tells us WHEN, camera confirms ball MOVED
+                            # This eliminates false triggers from practice swings!
+
+                            if DEBUG and frames_since_lock % 30 == 0:  # Print status every 30 frames
+                                radar_status = "IMPACT!" if self.kld2_impact_detected else "waiting..."
+                                ball_status = "MOVED" if camera_detected_motion else "stationary"
+                                print(f"K-LD2: {radar_status} | Camera: {ball_status} | Ball locked {frames_since_lock} frames")
+
+                            # Check if radar detected impact timing (club passed through)
+                            if self.kld2_impact_detected:
+                                # Radar says impact happened - now verify ball actually moved!
+                                if camera_detected_motion:
+                                    # CONFIRMED IMPACT: Radar + Camera both agree!
+                                    print(f"✅ CONFIRMED IMPACT: Radar detected club impact + Camera confirmed ball moved {directional_movement:.1f}px!")
+                                    impact_detected = True
+                                else:
+                                    # Practice swing: Radar detected club but ball didn't move
+                                    print(f"⚠️ PRACTICE SWING: Radar detected club but ball didn't move (movement: {directional_movement:.1f}px < threshold: {impact_threshold}px)")
+                                    print(f"   Resetting for next shot...")
+                                    # Reset radar flags and wait for next swing
+                                    self.kld2_triggered = False
+                                    self.kld2_impact_detected = False
+                                    self.waiting_for_impact = False
+                                    impact_detected = False
+                            else:
+                                # Still waiting for radar to detect impact timing
+                                impact_detected = False
+
+                        # === CAMERA-ONLY MOTION DETECTION MODE ===
+                        else:
+                            # Pure camera-based detection (no radar)
+                            impact_detected = camera_detected_motion
+
+                            # DEBUG: Print movement every 10 frames when ball is locked
+                            if DEBUG and frames_since_lock % 10 == 0:
+                                print(f"DEBUG: Ball ({int(original_ball[0])},{int(original_ball[1])}) → ({x},{y}) | Y-movement: {y - original_ball[1]:.1f} | Directional: {directional_movement:.1f} | Threshold: {impact_threshold}")
+
+                        if impact_detected:
+                            # IMPACT! Ball moved suddenly - it was HIT!
+                            if FAST_DETECTION_AVAILABLE:
+                                actual_distance = fast_detection.calculate_ball_distance(
+                                    int(original_ball[0]), int(original_ball[1]),
+                                    int(x), int(y)
+                                )
+                            else:
+                                # sqrt only here, once the impact has fired (for the log line)
+                                actual_distance = self._ball_displacement(original_ball, (x, y))
+
+                            print(f"IMPACT DETECTED - Ball moved {actual_distance:.1f} pixels!")
+                            print(f"   From ({int(original_ball[0])}, {int(original_ball[1])}) → ({x}, {y})")
+                            print(f"   Capturing impact sequence...")
+                            set_status("Capturing...", "red")
+
+                            self._handle_impact(frame_buffer, frame_queue, next_shot, captures_folder, frame_rate)
+
+                            # Reset for next capture (don't exit!)
+                            next_shot += 1
+                            original_ball = None
+                            stable_frames = 0
+                            last_seen_ball = None
+                            frames_since_seen = 0
+                            consecutive_frames_seen = 0
+                            prev_ball = None
+                            frames_since_lock = 0
+                            radius_history.clear()
+                            detection_history = 0
+                            frame_buffer.clear()
+
+                            # Reset K-LD2 trigger for next shot
+                            self.kld2_triggered = False
+
+                            # Reset hybrid ball tracker
+                            ball_tracker.reset()
+                            use_tracker = False
+
+                            print(f"\nReady for next shot (#{next_shot})...")
+                            set_status("No Ball Detected", "red")
+                            continue  # Continue loop for next capture
+                        else:
+                            # Ball hasn't moved yet - still waiting for shot
+                            set_status("Ball Locked - Waiting for shot...", "green")
+                            frames_since_lock += 1
+
+                else:
+                    # Ball not detected this frame
+                    frames_since_seen += 1
+                    consecutive_frames_seen = 0  # Reset consecutive seen counter
+
+                    # Track detection in history
+                    detection_history = (detection_history << 1) & 0x3FF
+
+                    # Ball has been gone too long - reset lock
+                    if original_ball is not None and frames_since_seen > 60:
+                        print(f"Ball lost for {frames_since_seen} frames - resetting lock")
+                        set_status("No Ball Detected", "red")
+                        original_ball = None
+                        stable_frames = 0
+                        prev_ball = None
+                        last_seen_ball = None
+                        frames_since_lock = 0
+                        radius_history.clear()  # Reset radius smoothing
+                    elif original_ball is not None and frames_since_seen <= 60:
+                        # Ball is locked but temporarily not visible (club head, hand, etc.)
+                        # Keep the "Ready" status - don't turn red
+                        # Status remains green from when ball was locked
+                        pass
+                    elif original_ball is None:
+                        # Ball not locked yet - brief tolerance for flickering
+                        if frames_since_seen < 5 and last_seen_ball is not None:
+                            set_status("Detecting ball...", "yellow")
+                        else:
+                            set_status("No Ball Detected", "red")
+                            stable_frames = 0
+                            prev_ball = None
+                            last_seen_ball = None
+                            radius_history.clear()  # Reset radius smoothing
+
+                # === VISUALIZATION RENDERING ===
+                # Only rendered when a debug frame is due (~every 5 seconds) -
+                # no per-frame BGR conversion or drawing on the hot path
+                debug_frame_counter += 1
+                if debug_frame_counter % (frame_rate * 5) == 0:  # Every 5 seconds
+                    # Create visualization frame (convert grayscale to BGR for colored annotations)
+                    # Drawn into a reused buffer - vis_frame is only used within this iteration
+                    vis_shape = (frame.shape[0], frame.shape[1], 3)
+                    if len(frame.shape) == 2:
+                        # 2D grayscale - convert to BGR for colored circles/text
+                        vis_frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR, dst=self._scratch("vis", vis_shape))
+                    elif len(frame.shape) == 3 and frame.shape[2] == 1:
+                        # 1-channel 3D grayscale - convert to BGR
+                        vis_frame = cv2.cvtColor(frame[:, :, 0], cv2.COLOR_GRAY2BGR, dst=self._scratch("vis", vis_shape))
+                    elif len(frame.shape) == 3 and frame.shape[2] == 3:
+                        # RGB - convert to BGR for cv2
+                        vis_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR, dst=self._scratch("vis", vis_shape))
+                    else:
+                        # Already BGR or other format - copy into the reused buffer (frame is read-only)
+                        vis_frame = self._scratch("vis", frame.shape, frame.dtype)
+                        np.copyto(vis_frame, frame)
+
+                    # Draw ball tracking circle if detected
+                    if current_ball is not None:
+                        x, y, r = int(current_ball[0]), int(current_ball[1]), int(current_ball[2])
+
+                        # Color code by motion state
+                        if motion_state == "STATIONARY":
+                            circle_color = (0, 255, 0)  # Green = stationary (locked)
+                        elif motion_state == "MOVING":
+                            circle_color = (0, 255, 255)  # Yellow = moving
+                        elif motion_state == "IMPACT":
+                            circle_color = (0, 0, 255)  # Red = impact detected
+                        else:
+                            circle_color = (255, 255, 255)  # White = unknown
+
+                        # Ball circle
+                        cv2.circle(vis_frame, (x, y), r, circle_color, 3)
+                        # Center point
+                        cv2.circle(vis_frame, (x, y), 3, circle_color, -1)
+                        # Position + velocity text
+                        cv2.putText(vis_frame, f"Ball: ({x}, {y}) r={r} v={velocity:.1f}px/f", (x + r + 5, y),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, circle_color, 2)
+
+                    # Draw FPS counter
+                    cv2.putText(vis_frame, f"FPS: {current_fps}", (10, 30),
+                               cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+
+                    # Draw status with motion state
+                    if original_ball is not None:
+                        status_text = f"LOCKED - {motion_state}"
+                        status_color = (0, 255, 0)  # Green
+                    elif current_ball is not None:
+                        status_text = f"Detecting ({stable_frames}/5) - {motion_state}"
+                        status_color = (0, 255, 255)  # Yellow
+                    else:
+                        status_text = "No Ball Detected"
+                        status_color = (0, 0, 255)  # Red
+
+                    cv2.putText(vis_frame, status_text, (10, 70),
+                               cv2.FONT_HERSHEY_SIMPLEX, 0.8, status_color, 2)
+
+                    # Draw edge velocity tracking info
+                    if current_ball is not None:
+                        info_y = 110
+                        cv2.putText(vis_frame, f"Velocity: {velocity:.2f} px/frame", (10, info_y),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                        cv2.putText(vis_frame, f"Motion: {motion_state}", (10, info_y + 25),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+                        cv2.putText(vis_frame, f"Stable: {stable_frames}/5", (10, info_y + 50),
+                                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 1)
+
+                    # Save debug frame
+                    self._save_frame("debug_detection_latest.jpg", vis_frame)
+                    # Print detection info periodically
+                    if current_ball is not None:
+                        lock_status = 'LOCKED' if original_ball is not None else 'Detecting'
+                        if original_ball is not None:
+                            # Show velocity if locked (for monitoring backswing vs hit)
+                            vel_px_sec = velocity * frame_rate
+                            print(f"FPS: {current_fps} | Ball: ({x},{y}) r={r} | {lock_status} | Vel: {vel_px_sec:.0f}px/s (hit@4000+)", flush=True)
+                        else:
+                            print(f"FPS: {current_fps} | Ball: ({x},{y}) r={r} | {lock_status}", flush=True)
+                    else:
+                        print(f"FPS: {current_fps} | No Ball", flush=True)
+
+                # No pacing sleep - frame_queue.get() blocks until the camera delivers
+
+        except Exception as e:
+            print(f"Capture error: {e}")
+            self.errorOccurred.emit(str(e))
+        finally:
+            # Stop the camera reader before the camera is closed under it
+            reader_stop.set()
+            if reader_thread is not None:
+                reader_thread.join(timeout=1.0)
+
+            try:
+                if self.picam2 is not None:
+                    self.picam2.stop()
+                    self.picam2.close()  # Properly close camera, not just stop
+                    self.picam2 = None
+                    print("Camera released and closed in cleanup")
+            except Exception as e:
+                print(f"Error releasing camera: {e}")
+                # Force set to None even if close fails
+                self.picam2 = None
+
+            self.is_running = False
+            self._stopping = False
+            self.capture_thread = None
+            print("🔓 Capture thread fully stopped and cleaned up")
+            print("📺 Debug frames saved to: debug_detection_latest.jpg")
+
+# ============================================
+# Sound Manager Class
+# ============================================
+class SoundManager(QObject):
+    """Manages sound effects for the app"""
+    
+    def __init__(self):
+        super().__init__()
+        self.click_sound = QSoundEffect()
+        self.success_sound = QSoundEffect()
+        
+        # Set up click sound
+        click_path = os.path.join(os.path.dirname(__file__), "sounds", "click.wav")
+        if os.path.exists(click_path):
+            self.click_sound.setSource(QUrl.fromLocalFile(click_path))
+            self.click_sound.setVolume(0.5)
+        else:
+            print(f"Click sound not found at: {click_path}")
+        
+        # Set up success sound
+        success_path = os.path.join(os.path.dirname(__file__), "sounds", "success.wav")
+        if os.path.exists(success_path):
+            self.success_sound.setSource(QUrl.fromLocalFile(success_path))
+            self.success_sound.setVolume(0.7)
+        else:
+            print(f"Success sound not found at: {success_path}")
+    
+    @Slot()
+    def playClick(self):
+        """Play button click sound"""
+        if self.click_sound.isLoaded():
+            self.click_sound.play()
+        else:
+            print("🔇 Click sound not loaded")
+    
+    @Slot()
+    def playSuccess(self):
+        """Play success sound (for shot simulation)"""
+        if self.success_sound.isLoaded():
+            self.success_sound.play()
+        else:
+            print("🔇 Success sound not loaded")
+
+# ============================================
+# Message Handler
+# ============================================
+def handler(msg_type, context, message):
+    print("QML:", message)
+
+# ============================================
+# Main Application
+# ============================================
+def main():
+    """Create the Qt application, managers and QML engine, and run the event loop"""
+    qInstallMessageHandler(handler)
+
+    # Keep GUI/QML rendering off the core reserved for camera capture threads
+    # (set before the app starts so Qt's render threads inherit it)
+    reserve_camera_core()
+
+    app = QGuiApplication(sys.argv)
+
+    # Create QML engine
+    engine = QQmlApplicationEngine()
+
+    # Create frame provider for high-FPS preview
+    frame_provider = FrameProvider()
+    engine.addImageProvider("frame", frame_provider)
+
+    # Create managers
+    settings_manager = SettingsManager()
+    camera_manager = CameraManager(settings_manager, frame_provider)
+    # K-LD2 radar sensor for speed and detection (20480 Hz sampling rate)
+    # Trigger on CLUB HEAD (approaching) to capture pre-impact frames
+    # Min speed 50 mph (club downswing) to avoid false triggers
+    kld2_manager = KLD2Manager(min_trigger_speed=50.0, debug_mode=True, trigger_mode="club")
+    capture_manager = CaptureManager(settings_manager, camera_manager, kld2_manager)
+    sound_manager = SoundManager()
+    profile_manager = ProfileManager()
+    history_manager = HistoryManager()
+
+    # Expose managers to QML
+    engine.rootContext().setContextProperty("cameraManager", camera_manager)
+    engine.rootContext().setContextProperty("captureManager", capture_manager)
+    engine.rootContext().setContextProperty("kld2Manager", kld2_manager)
+    engine.rootContext().setContextProperty("soundManager", sound_manager)
+    engine.rootContext().setContextProperty("profileManager", profile_manager)
+    engine.rootContext().setContextProperty("historyManager", history_manager)
+    engine.rootContext().setContextProperty("settingsManager", settings_manager)
+    
+    # Load main QML
+    engine.load('main.qml')
+    
+    if not engine.rootObjects():
+        print("QML failed to load. See messages above.")
+        sys.exit(-1)
+
+    sys.exit(app.exec())
\ No newline at end of file
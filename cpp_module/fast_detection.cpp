@@ -12,6 +12,11 @@
 #include <vector>
 #include <tuple>
 
+#if defined(__ARM_NEON) || defined(__ARM_NEON__)
+#include <arm_neon.h>
+#define FAST_DETECTION_NEON 1
+#endif
+
 namespace py = pybind11;
 
 /**
@@ -331,8 +336,10 @@ double calculate_ball_distance(int prev_x, int prev_y, int curr_x, int curr_y) {
  *
  * Args:
  *   frame_array: uint16 numpy array (H x W) containing 10-bit Bayer RAW data
+ *   upscale: Resize the 2x2-averaged image back to H x W (default true);
+ *            false returns the half-resolution image and skips the resize pass
  *
- * Returns: uint8 numpy array (H x W) containing grayscale image
+ * Returns: uint8 numpy array (H x W, or H/2 x W/2 without upscale) containing grayscale image
  *
  * Performance: ~0.1ms for 320x240 @ 120 FPS (vs 0.5-1ms for NumPy)
  *
@@ -342,7 +349,7 @@ double calculate_ball_distance(int prev_x, int prev_y, int curr_x, int curr_y) {
  *   R  G1  R  G1
  *   G2 B   G2 B
  */
-py::array_t<uint8_t> bayer_to_gray(py::array_t<uint16_t> frame_array) {
+py::array_t<uint8_t> bayer_to_gray(py::array_t<uint16_t> frame_array, bool upscale = true) {
     py::buffer_info buf = frame_array.request();
 
     // Validate input format (10-bit Bayer RAW = uint16, 2D array)
@@ -364,40 +371,67 @@ py::array_t<uint8_t> bayer_to_gray(py::array_t<uint16_t> frame_array) {
     int out_h = h / 2;
     int out_w = w / 2;
 
-    // Allocate output array
-    py::array_t<uint8_t> result({height, width});
+    // Allocate output array - without upscale the half-resolution image is written into it directly
+    py::array_t<uint8_t> result = upscale ? py::array_t<uint8_t>({height, width})
+                                          : py::array_t<uint8_t>({out_h, out_w});
     py::buffer_info result_buf = result.request();
     uint8_t* output = static_cast<uint8_t*>(result_buf.ptr);
 
-    // Temporary buffer for half-resolution grayscale
-    std::vector<uint8_t> gray_small(out_h * out_w);
+    // Temporary buffer for half-resolution grayscale (only needed when upscaling)
+    std::vector<uint8_t> gray_small_buf(upscale ? out_h * out_w : 0);
+    uint8_t* gray_small = upscale ? gray_small_buf.data() : output;
 
     // FAST Bayer debayer: Average 2x2 blocks (R + G1 + G2 + B) / 4
     // Scale from 10-bit (0-1023) to 8-bit (0-255) by dividing by 4
     for (int y = 0; y < out_h; ++y) {
-        for (int x = 0; x < out_w; ++x) {
-            // Input indices for 2x2 Bayer block
-            int in_y = y * 2;
-            int in_x = x * 2;
-
-            // Extract RGGB pattern:
-            //   [R  G1]
-            //   [G2 B ]
-            uint16_t R  = input[in_y * width + in_x];           // Top-left
-            uint16_t G1 = input[in_y * width + in_x + 1];       // Top-right
-            uint16_t G2 = input[(in_y + 1) * width + in_x];     // Bottom-left
-            uint16_t B  = input[(in_y + 1) * width + in_x + 1]; // Bottom-right
+        // Extract RGGB pattern:
+        //   [R  G1]   <- row0
+        //   [G2 B ]   <- row1
+        const uint16_t* row0 = input + (y * 2) * width;
+        const uint16_t* row1 = row0 + width;
+        uint8_t* out = gray_small + y * out_w;
+        int x = 0;
+
+#ifdef FAST_DETECTION_NEON
+        // 8 output pixels (16 input columns x 2 rows) per iteration
+        for (; x + 8 <= out_w; x += 8) {
+            uint16x8x2_t top = vld2q_u16(row0 + x * 2);  // val[0] = R,  val[1] = G1
+            uint16x8x2_t bot = vld2q_u16(row1 + x * 2);  // val[0] = G2, val[1] = B
+
+            // Widen to 32-bit so full 16-bit samples can't overflow the sum
+            uint32x4_t sum_lo = vaddl_u16(vget_low_u16(top.val[0]), vget_low_u16(top.val[1]));
+            sum_lo = vaddw_u16(sum_lo, vget_low_u16(bot.val[0]));
+            sum_lo = vaddw_u16(sum_lo, vget_low_u16(bot.val[1]));
+            uint32x4_t sum_hi = vaddl_u16(vget_high_u16(top.val[0]), vget_high_u16(top.val[1]));
+            sum_hi = vaddw_u16(sum_hi, vget_high_u16(bot.val[0]));
+            sum_hi = vaddw_u16(sum_hi, vget_high_u16(bot.val[1]));
+
+            // (sum / 16), saturated to 255 - same result as the scalar loop
+            uint16x8_t avg = vcombine_u16(vqshrn_n_u32(sum_lo, 4), vqshrn_n_u32(sum_hi, 4));
+            vst1_u8(out + x, vqmovn_u16(avg));
+        }
+#endif
+
+        for (; x < out_w; ++x) {
+            uint16_t R  = row0[x * 2];      // Top-left
+            uint16_t G1 = row0[x * 2 + 1];  // Top-right
+            uint16_t G2 = row1[x * 2];      // Bottom-left
+            uint16_t B  = row1[x * 2 + 1];  // Bottom-right
 
             // Average and scale: (R + G1 + G2 + B) / 4 / 4
             // Divide by 4 to average, divide by 4 again to convert 10-bit to 8-bit
-            uint32_t avg = (R + G1 + G2 + B) / 16;
+            uint32_t avg = (static_cast<uint32_t>(R) + G1 + G2 + B) / 16;
 
-            gray_small[y * out_w + x] = static_cast<uint8_t>(std::min(avg, 255u));
+            out[x] = static_cast<uint8_t>(std::min(avg, 255u));
         }
     }
 
+    if (!upscale) {
+        return result;
+    }
+
     // Resize back to original resolution using bilinear interpolation
-    cv::Mat gray_small_mat(out_h, out_w, CV_8UC1, gray_small.data());
+    cv::Mat gray_small_mat(out_h, out_w, CV_8UC1, gray_small);
     cv::Mat gray_full(height, width, CV_8UC1, output);
     cv::resize(gray_small_mat, gray_full, cv::Size(width, height), 0, 0, cv::INTER_LINEAR);
 
@@ -445,8 +479,9 @@ PYBIND11_MODULE(fast_detection, m) {
           "Convert 10-bit Bayer RAW (SRGGB10) to 8-bit grayscale. 5-10x faster than NumPy.\n"
           "Args:\n"
           "  frame: uint16 numpy array (H x W) with Bayer RAW data\n"
+          "  upscale: Resize back to H x W (default True); False returns H/2 x W/2\n"
           "Returns:\n"
           "  uint8 numpy array (H x W) with grayscale image\n"
           "Performance: ~0.1ms for 320x240 (vs 0.5-1ms NumPy)",
-          py::arg("frame"));
+          py::arg("frame"), py::arg("upscale") = true);
 }
@@ -0,0 +1,383 @@
+"""
+High-FPS Preview Capture Process
+Runs the camera preview loop in a separate Python process (own GIL) and
+hands frames to the Qt app through a shared-memory double buffer
+"""
+
+import os
+import time
+import multiprocessing as mp
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Verbose per-frame/per-second logging (set PRGR_DEBUG=1) - off by default to keep
+# stdout writes (a global lock + tty flush) out of the capture hot paths
+DEBUG = os.environ.get("PRGR_DEBUG", "") not in ("", "0")
+
+# Try to import Picamera2 and cv2 (only works on Pi)
+try:
+    from picamera2 import Picamera2, MappedArray
+    import cv2
+    CAMERA_AVAILABLE = True
+except ImportError:
+    CAMERA_AVAILABLE = False
+
+# Try to import fast C++ detection module (for Bayer conversion)
+try:
+    import fast_detection
+    FAST_DETECTION_AVAILABLE = True
+except ImportError:
+    FAST_DETECTION_AVAILABLE = False
+
+# ============================================
+# CPU Affinity Helpers (Linux / Raspberry Pi)
+# ============================================
+CAMERA_CPU_CORE = 2  # Core reserved for camera capture threads (Pi has 4 cores)
+
+def _camera_core_available():
+    """True if the OS supports affinity and the reserved camera core exists"""
+    return hasattr(os, "sched_setaffinity") and (os.cpu_count() or 1) > CAMERA_CPU_CORE
+
+def reserve_camera_core():
+    """Keep the GUI/QML threads off the camera core (call once at startup)"""
+    if not _camera_core_available():
+        return
+    try:
+        other_cores = set(range(os.cpu_count())) - {CAMERA_CPU_CORE}
+        os.sched_setaffinity(0, other_cores)
+    except OSError as e:
+        print(f"Could not set GUI CPU affinity: {e}")
+
+def pin_capture_thread():
+    """Pin the calling thread to the camera core and raise its scheduling priority
+
+    Avoids core migrations and scheduling gaps (frame drops) while QML renders on
+    the other cores. SCHED_FIFO needs CAP_SYS_NICE/root - falls back to nice(-10),
+    and silently keeps default priority if that is not permitted either.
+    """
+    if not _camera_core_available():
+        return
+    try:
+        os.sched_setaffinity(0, {CAMERA_CPU_CORE})  # pid 0 = calling thread on Linux
+    except OSError as e:
+        print(f"Could not pin capture thread to core {CAMERA_CPU_CORE}: {e}")
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(10))
+    except (OSError, AttributeError):
+        try:
+            os.nice(-10)
+        except OSError:
+            pass  # Not permitted - keep default priority
+
+# ============================================
+# Camera Controls
+# ============================================
+def manual_camera_controls(frame_rate, shutter_speed, gain):
+    """Fully manual Picamera2 controls - fixed ISP pipeline, no AE/AWB retuning
+
+    Locking AE/AWB and the frame duration stops the ISP from periodically
+    retuning (brightness pops and frame-time jitter).
+    """
+    frame_duration = int(1e6 / frame_rate)  # µs
+    return {
+        "FrameRate": frame_rate,
+        "ExposureTime": shutter_speed,
+        "AnalogueGain": gain,
+        "AeEnable": False,
+        "AwbEnable": False,
+        "FrameDurationLimits": (frame_duration, frame_duration),
+        "NoiseReductionMode": 0  # Off
+    }
+
+# ============================================
+# Shared Frame Buffer
+# ============================================
+class SharedFrameBuffer:
+    """Lock-free triple buffer of 8-bit grayscale frames in shared memory
+
+    The capture process writes into a free slot, then publishes it by updating
+    `latest` and `seq` (single int stores). The GUI process marks the slot it is
+    copying as `reading`; the writer never picks the latest or the reading slot,
+    so a frame can't be overwritten mid-copy. Must be created by the parent and
+    passed to the child as a Process argument.
+    """
+
+    SLOTS = 3
+
+    def __init__(self, ctx, max_width, max_height):
+        self.slot_bytes = max_width * max_height
+        self.shm = shared_memory.SharedMemory(create=True, size=self.slot_bytes * self.SLOTS)
+        self._latest = ctx.RawValue('i', 0)     # Index of the most recently written slot
+        self._reading = ctx.RawValue('i', -1)   # Slot the GUI process is copying (-1 = none)
+        self._seq = ctx.RawValue('i', 0)        # Incremented on every published frame
+        self._shapes = ctx.RawArray('i', 2 * self.SLOTS)  # (height, width) per slot
+        self._fps = ctx.RawValue('d', 0.0)      # Smoothed capture FPS (published periodically)
+
+    @property
+    def seq(self):
+        return self._seq.value
+
+    @property
+    def fps(self):
+        return self._fps.value
+
+    @fps.setter
+    def fps(self, value):
+        self._fps.value = value
+
+    def write(self, frame):
+        """Copy a 2D uint8 frame into a free slot and publish it (capture process)"""
+        height, width = frame.shape
+        if height * width > self.slot_bytes:
+            return False
+
+        # Any slot that is neither the latest nor being read - always exists with 3
+        latest, reading = self._latest.value, self._reading.value
+        back = 0 if latest != 0 and reading != 0 else (1 if latest != 1 and reading != 1 else 2)
+        slot = np.ndarray((height, width), dtype=np.uint8, buffer=self.shm.buf,
+                          offset=back * self.slot_bytes)
+        np.copyto(slot, frame)
+        self._shapes[back * 2] = height
+        self._shapes[back * 2 + 1] = width
+
+        # Publish
+        self._latest.value = back
+        self._seq.value += 1
+        return True
+
+    def acquire_latest(self):
+        """Return a view of the most recently published frame (GUI process)
+
+        The slot stays reserved until release_latest() - copy it, then release.
+        """
+        while True:
+            index = self._latest.value
+            self._reading.value = index
+            # Re-check: if a newer frame was published before the reservation
+            # landed, the writer may already be reusing index - take the new one
+            if self._latest.value == index:
+                break
+        height = self._shapes[index * 2]
+        width = self._shapes[index * 2 + 1]
+        return np.ndarray((height, width), dtype=np.uint8, buffer=self.shm.buf,
+                          offset=index * self.slot_bytes)
+
+    def release_latest(self):
+        """Give the slot reserved by acquire_latest() back to the writer"""
+        self._reading.value = -1
+
+    def close(self, unlink=False):
+        """Release the shared memory mapping (and the segment itself if unlink=True)"""
+        try:
+            self.shm.close()
+            if unlink:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError) as e:
+            print(f"Shared frame buffer cleanup warning: {e}")
+
+# ============================================
+# Preview Capture Process
+# ============================================
+def get_context():
+    """Multiprocessing context for the capture process
+
+    Uses spawn - forking a running Qt application is unsafe.
+    """
+    return mp.get_context("spawn")
+
+def convert_bayer_to_gray(frame):
+    """Convert Bayer RAW (SRGGB10) to grayscale using C++ or OpenCV fallback
+
+    C++ version: ~0.1ms per frame
+    OpenCV fallback: pack to 8-bit + SIMD demosaic, no float temporaries
+    """
+    # Check if this is 10-bit Bayer RAW data (uint16, single channel)
+    if frame.dtype == np.uint16 and len(frame.shape) == 2:
+        # Try C++ version first (5-10x faster)
+        if FAST_DETECTION_AVAILABLE:
+            try:
+                # Half resolution is enough for display - QML scales it up on the GPU
+                return fast_detection.bayer_to_gray(frame, upscale=False)
+            except Exception as e:
+                print(f"C++ bayer conversion failed, using OpenCV fallback: {e}")
+                # Fall through to OpenCV version
+
+        # OpenCV fallback: pack 10-bit to 8-bit (one SIMD pass, no float temporaries),
+        # then OpenCV's demosaic straight to full-resolution gray - no downscale/resize
+        # RGGB Bayer pattern: [R  G1]
+        #                     [G2 B ]
+        bayer8 = cv2.convertScaleAbs(frame, alpha=0.25)  # 0-1023 -> 0-255
+        return cv2.cvtColor(bayer8, cv2.COLOR_BayerRG2GRAY)
+    else:
+        # Not Bayer RAW, return as-is
+        return frame
+
+MAX_CAPTURE_FAILURES = 30  # Consecutive capture errors tolerated before the preview aborts
+
+def run_preview(settings, frame_buffer, stop_event):
+    """Preview capture loop (runs in the child process until stop_event is set)
+
+    Args:
+        settings: Dict with resolution, camera_format, shutter_speed, gain, frame_rate
+        frame_buffer: SharedFrameBuffer to publish grayscale frames into
+        stop_event: multiprocessing Event set by the GUI process to stop
+    """
+    pin_capture_thread()
+    picam2 = None
+    try:
+        resolution = settings["resolution"]
+        camera_format = settings["camera_format"]
+        shutter_speed = settings["shutter_speed"]
+        gain = settings["gain"]
+        frame_rate = settings["frame_rate"]
+
+        # Initialize camera
+        picam2 = Picamera2()
+
+        # Enough camera buffers to absorb scheduling/GC hiccups in this loop
+        # (display latency matters less than dropped frames in the preview)
+        buffer_count = 6 if frame_rate >= 100 else 4
+
+        # Configure based on format
+        # NOTE: OV9281 is MONOCHROME - outputs native Y (grayscale), NOT Bayer RGB!
+        if camera_format == "RAW":
+            # RAW format for high FPS (bypasses ISP completely)
+            # Use lores stream which gets direct sensor output without ISP processing
+            config = picam2.create_video_configuration(
+                main={"size": (640, 480), "format": "YUV420"},  # Dummy main (required but not used)
+                lores={"size": resolution, "format": "YUV420"},  # THIS is what we actually capture - bypasses ISP!
+                buffer_count=buffer_count,
+                controls=manual_camera_controls(frame_rate, shutter_speed, gain)
+            )
+            stream = "lores"  # Capture from lores instead of main
+        else:
+            # YUV420 format (ISP processed, lower FPS)
+            # Request YUV420 explicitly - the default XBGR8888 would need a per-frame
+            # RGBA->gray conversion, while YUV420 lets us just slice the Y plane
+            config = picam2.create_video_configuration(
+                main={"size": resolution, "format": "YUV420"},
+                buffer_count=buffer_count,
+                controls=manual_camera_controls(frame_rate, shutter_speed, gain)
+            )
+            stream = "main"
+
+        picam2.configure(config)
+        picam2.start()
+
+        # Warmup
+        print("   Warming up camera...")
+        time.sleep(0.5)
+        for i in range(5):
+            _ = picam2.capture_array()
+            time.sleep(0.02)
+        print("   Camera ready")
+
+        # Hoist loop invariants into locals (avoids per-frame attribute lookups)
+        perf_counter = time.perf_counter
+        sleep = time.sleep
+        capture = picam2.capture_request
+        publish = frame_buffer.write
+        stopped = stop_event.is_set
+        width, height = resolution  # e.g., (320, 240)
+        yuv_height = height * 3 // 2  # YUV420 frame height = resolution height × 1.5
+
+        def publish_frame(frame, frame_count):
+            """Extract the grayscale image from a captured frame and publish it"""
+            # DEBUG: Print frame info on first few captures
+            if frame_count < 3:
+                print(f"   [Frame {frame_count}] BEFORE processing: shape={frame.shape}, dtype={frame.dtype}, size={frame.size}, min/max={frame.min()}/{frame.max()}")
+
+            # Convert from camera format to grayscale for display
+            # lores stream outputs YUV420 format (even for monochrome camera)
+            # YUV420 stacks Y, U, V planes vertically: (height*1.5, width)
+            if len(frame.shape) == 2:
+                # Check if this is YUV420 format
+                if frame.shape[0] == yuv_height:  # YUV420 detected
+                    # Extract Y channel (first 'height' rows, cropping any stride padding)
+                    # For 320×240: extract rows 0-239 from (360, 320) frame
+                    frame = frame[:height, :width]
+                    if frame_count < 3:
+                        print(f"   [Frame {frame_count}] AFTER Y extraction: shape={frame.shape}, size={frame.size}")
+                # else: already grayscale
+            elif len(frame.shape) == 3:
+                # Multi-channel format
+                if frame.shape[2] == 3:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+                elif frame.shape[2] == 4:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_RGBA2GRAY)
+                elif frame.shape[2] == 1:
+                    frame = frame[:, :, 0]  # Squeeze single channel
+
+            # Convert Bayer RAW to grayscale if needed (for color Bayer sensors)
+            # OV9281 is monochrome so this will just return frame as-is
+            frame = convert_bayer_to_gray(frame)
+
+            # DEBUG: Final frame shape before display
+            if frame_count < 3:
+                print(f"   [Frame {frame_count}] FINAL (sending to display): shape={frame.shape}, size={frame.size}")
+
+            # Publish to the GUI process (lock-free back-slot swap)
+            if not publish(frame) and frame_count == 0:
+                print(f"   Frame {frame.shape} does not fit shared preview buffer - not displayed")
+
+        # FPS tracking - EWMA of instantaneous rate, published to the GUI every 30 frames
+        fps_ewma = 0.0
+        last_now = perf_counter()
+        frame_count = 0  # For debug output
+        capture_failures = 0  # Consecutive capture errors (abort after MAX_CAPTURE_FAILURES)
+
+        # Main preview loop
+        while not stopped():
+
+            # Capture request (lores stream if in RAW mode, otherwise main stream)
+            # Transient errors (EAGAIN, NoMemory) drop a frame instead of killing the preview
+            try:
+                request = capture()
+                capture_failures = 0
+            except Exception as e:
+                capture_failures += 1
+                if capture_failures > MAX_CAPTURE_FAILURES:
+                    raise
+                if capture_failures == 1 or capture_failures % 10 == 0:
+                    print(f"   Capture failed ({capture_failures} in a row): {e}")
+                sleep(0.005)
+                continue
+
+            # Read straight from the mapped camera buffer - the only copy is the
+            # publish into shared memory; the request is released right after
+            try:
+                with MappedArray(request, stream) as mapped:
+                    publish_frame(mapped.array, frame_count)
+            finally:
+                request.release()
+            frame_count += 1
+
+            # No software pacing - capture() blocks until the sensor delivers the next
+            # frame, and FrameDurationLimits already fixes the sensor's frame rate
+            now = perf_counter()
+
+            # FPS tracking
+            dt = now - last_now
+            last_now = now
+            if dt > 0:
+                fps_ewma = 0.9 * fps_ewma + 0.1 * (1.0 / dt)
+            if frame_count % 30 == 0:
+                frame_buffer.fps = fps_ewma
+                if DEBUG:
+                    print(f"Preview FPS: {fps_ewma:.1f}")
+
+        print("🔓 Preview loop finished")
+
+    except Exception as e:
+        print(f"Preview error: {e}")
+    finally:
+        if picam2 is not None:
+            try:
+                picam2.stop()
+                picam2.close()
+            except:
+                pass
+
+        frame_buffer.close()
+        print("Preview cleanup complete")
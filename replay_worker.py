@@ -0,0 +1,97 @@
+"""
+Replay GIF encoder - runs in a worker process
+
+Kept separate from the Qt application (app.py) so the spawned worker only
+imports this module - and OpenCV/PIL on first use. The spawn start method also
+re-runs the entry script in the worker, which is why main.py is a bare launcher.
+"""
+
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+# OpenCV + PIL for GIF creation (for popup replay) - probed only; the actual
+# imports happen in the worker process on first use, not at GUI startup
+GIF_AVAILABLE = (importlib.util.find_spec("cv2") is not None
+                 and importlib.util.find_spec("PIL") is not None)
+
+
+def frame_to_rgb(frame):
+    """Convert frame to RGB for GIF (handle all formats), None if unsupported"""
+    import cv2
+
+    if len(frame.shape) == 2:
+        # Grayscale (H, W) - convert to RGB
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2RGB)
+    elif len(frame.shape) == 3:
+        if frame.shape[2] == 1:
+            # Grayscale (H, W, 1) - squeeze and convert to RGB
+            return cv2.cvtColor(frame[:, :, 0], cv2.COLOR_GRAY2RGB)
+        elif frame.shape[2] == 3:
+            # RGB - keep as-is
+            return frame
+        elif frame.shape[2] == 4:
+            # RGBA/XBGR - convert to RGB
+            return cv2.cvtColor(frame, cv2.COLOR_BGRA2RGB)
+
+    print(f"Unsupported frame shape for GIF: {frame.shape}")
+    return None
+
+
+def encode_replay_gif(frames, output_path, fps=60, speed_multiplier=0.1):
+    """Create animated GIF from captured frames (for popup playback)
+
+    Runs in a worker process (see CaptureManager._gif_pool) so LZW encoding
+    never blocks the capture thread.
+
+    Args:
+        frames: List of frames to convert to GIF
+        output_path: Path to save the GIF
+        fps: Original capture frame rate
+        speed_multiplier: Playback speed (0.1 = 10x slower for frame-by-frame visibility)
+    """
+    if not GIF_AVAILABLE:
+        print("PIL not available - cannot create GIF for popup")
+        return None
+
+    try:
+        from PIL import Image as PILImage
+
+        print(f"Creating popup GIF with {len(frames)} frames at {speed_multiplier}x speed...")
+
+        # Convert frames in parallel (cvtColor releases the GIL). Pillow's GIF writer
+        # keeps every appended frame in memory until it writes, so a plain list costs
+        # nothing extra
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            pil_frames = [PILImage.fromarray(rgb_frame)
+                          for rgb_frame in pool.map(frame_to_rgb, frames)
+                          if rgb_frame is not None]
+
+        if not pil_frames:
+            print("No valid frames to create GIF")
+            return None
+
+        # Calculate frame duration in milliseconds
+        # Slower speed = longer duration between frames
+        base_duration = int(1000 / fps)  # ms per frame at original speed
+        frame_duration = int(base_duration / speed_multiplier)  # Adjust for speed
+
+        print(f"   Frame duration: {frame_duration}ms per frame (original: {base_duration}ms)")
+        print(f"   Total frames: {len(frames)} frames")
+
+        # Save as animated GIF
+        pil_frames[0].save(
+            output_path,
+            save_all=True,
+            append_images=pil_frames[1:],
+            duration=frame_duration,  # Same duration for every frame
+            loop=0,  # Loop forever
+            optimize=False,  # Don't optimize - preserve exact timing
+            disposal=1  # Do not dispose (keep each frame)
+        )
+
+        print(f"Popup GIF saved: {output_path}")
+        return output_path
+
+    except Exception as e:
+        print(f"Failed to create GIF: {e}")
+        return None
@@ -13,6 +13,12 @@ Item {
     property bool snapshotCountdownActive: false
     property int snapshotCountdown: 10
 
+    // Preview frames are only copied/converted while they can actually be seen
+    readonly property bool previewVisible: visible
+                                           && Qt.application.state !== Qt.ApplicationHidden
+                                           && Qt.application.state !== Qt.ApplicationSuspended
+    onPreviewVisibleChanged: cameraManager.setPreviewVisible(previewVisible)
+
     // Theme colors matching MyBag.qml
     readonly property color bg: "#F5F7FA"
     readonly property color card: "#FFFFFF"
@@ -570,6 +576,13 @@ Item {
             recordingMessage.visible = true
             recordingTimer.start()
         }
+
+        function onRecordingFailed(reason) {
+            recordingActive = false
+            recordingMessageText.text = "Recording failed:\n" + reason
+            recordingMessage.visible = true
+            recordingTimer.start()
+        }
     }
 
     Timer {
@@ -579,6 +592,7 @@ Item {
     }
 
     Component.onDestruction: {
+        cameraManager.setPreviewVisible(true)
         if (cameraActive) {
             cameraManager.stopPreview()
         }